@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from reviews.models import User
+
+TOKEN_CLAIMS = ('username', 'role', 'is_superuser')
+
+
+def changed_key(user_id):
+    return f'auth:changed:{user_id}'
+
+
+def mark_user_changed(user_id, changed_at):
+    """Запоминает, что токены, выданные до changed_at, устарели."""
+    cache.set(
+        changed_key(user_id),
+        changed_at,
+        api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей.
+
+    Пользователь собирается из полей токена, выданного TokenSerializer.
+    Если после выдачи токена роль пользователя менялась или он был
+    заблокирован, пользователь загружается из базы, как обычно.
+    """
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in TOKEN_CLAIMS):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        changed_at = cache.get(changed_key(user_id))
+        if changed_at is not None and validated_token['iat'] <= changed_at:
+            return super().get_user(validated_token)
+
+        user = User(
+            id=user_id,
+            username=validated_token['username'],
+            role=validated_token['role'],
+            is_superuser=validated_token['is_superuser'],
+        )
+        user._state.adding = False
+        user.from_token = True
+        return user
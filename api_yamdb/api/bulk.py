@@ -0,0 +1,250 @@
+from api.cache import invalidate
+from api.exceptions import CodeAPIException
+from api.serializers import (BulkReviewSerializer, BulkSlugSerializer,
+                             BulkTitleSerializer)
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+from reviews.ratings import recalculate_ratings
+from reviews.search import index_review_titles, index_titles
+
+NOT_FOUND = 'Объект с {}={} не существует.'
+DUPLICATE = 'Объект уже встречается в пакете.'
+CONFLICT = 'Объекты пакета одновременно изменены другим запросом.'
+
+
+def validate(serializer_class, items):
+    """Проверяет элементы пакета по отдельности, не обращаясь к базе."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    return valid, errors
+
+
+def resolve(model, field, values):
+    """Переводит slug или username в id одним запросом."""
+    values = set(values)
+    if not values:
+        return {}
+    return dict(model.objects.filter(
+        **{f'{field}__in': values}
+    ).values_list(field, 'pk'))
+
+
+def report(created, updated, errors):
+    return {
+        'created': created,
+        'updated': updated,
+        'errors': sorted(errors, key=lambda error: error['index']),
+    }
+
+
+def touch_related_titles(relation, slugs, now):
+    """Обновляет updated_at произведений, в которые встроено имя."""
+    titles = list(Title.objects.filter(
+        **{f'{relation}__slug__in': slugs}
+    ).values_list('pk', flat=True).distinct())
+    Title.objects.filter(pk__in=titles).update(updated_at=now)
+    return titles
+
+
+def upsert_by_slug(model, items, scope, relation, retries=1):
+    valid, errors = validate(BulkSlugSerializer, items)
+    existing = model.objects.in_bulk(
+        [data['slug'] for _, data in valid], field_name='slug')
+    seen, to_create, to_update, updated = set(), [], [], []
+    for index, data in valid:
+        if data['slug'] in seen:
+            errors.append({'index': index, 'errors': {'slug': [DUPLICATE]}})
+            continue
+        seen.add(data['slug'])
+        instance = existing.get(data['slug'])
+        if instance is None:
+            to_create.append(model(**data))
+            continue
+        updated.append(data['slug'])
+        if instance.name != data['name']:
+            instance.name = data['name']
+            to_update.append(instance)
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(to_create)
+            model.objects.bulk_update(to_update, ('name',))
+            # bulk_update не вызывает сигналов, обновляющих произведения
+            titles = touch_related_titles(
+                relation, [item.slug for item in to_update], timezone.now())
+    except IntegrityError:
+        # Тот же slug только что создан другим запросом: теперь это
+        # обновление существующего объекта.
+        if not retries:
+            raise CodeAPIException(detail=CONFLICT, status_code=409)
+        return upsert_by_slug(model, items, scope, relation, retries - 1)
+    if to_create or to_update:
+        invalidate(scope, *(f'title:{pk}' for pk in titles))
+    return report([item.slug for item in to_create], updated, errors)
+
+
+def upsert_categories(items):
+    return upsert_by_slug(Category, items, 'categories', 'category')
+
+
+def upsert_genres(items):
+    return upsert_by_slug(Genre, items, 'genres', 'genre')
+
+
+def create_titles(titles):
+    if connection.features.can_return_ids_from_bulk_insert:
+        Title.objects.bulk_create(titles)
+        return
+    # Без RETURNING bulk_create не заполняет id, а они нужны для жанров.
+    for title in titles:
+        title.save(force_insert=True)
+
+
+def title_errors(data, categories, genres):
+    errors = {}
+    category = data.get('category')
+    if category and category not in categories:
+        errors['category'] = [NOT_FOUND.format('slug', category)]
+    missing = [slug for slug in data['genre'] if slug not in genres]
+    if missing:
+        errors['genre'] = [NOT_FOUND.format('slug', slug) for slug in missing]
+    return errors
+
+
+def save_titles(items):
+    valid, errors = validate(BulkTitleSerializer, items)
+    categories = resolve(Category, 'slug', (
+        data['category'] for _, data in valid if data.get('category')))
+    genres = resolve(Genre, 'slug', (
+        slug for _, data in valid for slug in data['genre']))
+    existing = Title.objects.in_bulk(
+        [data['id'] for _, data in valid if 'id' in data])
+    seen, to_create, to_update, links = set(), [], [], []
+    for index, data in valid:
+        item_errors = title_errors(data, categories, genres)
+        if 'id' in data and data['id'] not in existing:
+            item_errors['id'] = [NOT_FOUND.format('id', data['id'])]
+        elif 'id' in data and data['id'] in seen:
+            item_errors['id'] = [DUPLICATE]
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        if 'id' in data:
+            seen.add(data['id'])
+            title = existing[data['id']]
+            to_update.append(title)
+        else:
+            title = Title()
+            to_create.append(title)
+        title.name = data['name']
+        title.year = data['year']
+        title.description = data.get('description')
+        title.category_id = categories.get(data.get('category'))
+        links.append((title, dict.fromkeys(data['genre'])))
+
+    now = timezone.now()
+    for title in to_update:
+        title.updated_at = now
+    with transaction.atomic():
+        create_titles(to_create)
+        Title.objects.bulk_update(
+            to_update,
+            ('name', 'year', 'description', 'category', 'updated_at')
+        )
+        GenreTitle.objects.filter(title__in=to_update).delete()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre_id=genres[slug])
+            for title, slugs in links for slug in slugs
+        )
+        if links:
+            index_titles([title.pk for title, _ in links])
+    if links:
+        invalidate('titles', *(f'title:{title.pk}' for title, _ in links))
+    return report(
+        [title.pk for title in to_create],
+        [title.pk for title in to_update],
+        errors
+    )
+
+
+def fill_review_ids(reviews):
+    """Подставляет id созданных отзывов, если база их не вернула."""
+    ids = {
+        (title_id, author_id): pk
+        for pk, title_id, author_id in Review.objects.filter(
+            title_id__in={review.title_id for review in reviews},
+            author_id__in={review.author_id for review in reviews}
+        ).values_list('pk', 'title_id', 'author_id')
+    }
+    for review in reviews:
+        review.pk = ids[(review.title_id, review.author_id)]
+
+
+def review_errors(data, titles, authors):
+    errors = {}
+    if data['title'] not in titles:
+        errors['title'] = [NOT_FOUND.format('id', data['title'])]
+    if data['author'] not in authors:
+        errors['author'] = [NOT_FOUND.format('username', data['author'])]
+    return errors
+
+
+def upsert_reviews(items):
+    """Создает или обновляет отзывы по паре (автор, произведение)."""
+    valid, errors = validate(BulkReviewSerializer, items)
+    titles = set(Title.objects.filter(
+        pk__in={data['title'] for _, data in valid}
+    ).values_list('pk', flat=True))
+    authors = resolve(User, 'username', (data['author'] for _, data in valid))
+    existing = {
+        (review.title_id, review.author_id): review
+        for review in Review.objects.filter(
+            title_id__in=titles, author_id__in=authors.values())
+    }
+    seen, to_create, to_update = set(), [], []
+    for index, data in valid:
+        item_errors = review_errors(data, titles, authors)
+        key = (data['title'], authors.get(data['author']))
+        if not item_errors and key in seen:
+            item_errors['author'] = [DUPLICATE]
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        seen.add(key)
+        review = existing.get(key)
+        if review is None:
+            review = Review(title_id=key[0], author_id=key[1])
+            to_create.append(review)
+        else:
+            to_update.append(review)
+        review.text = data['text']
+        review.score = data['score']
+
+    now = timezone.now()
+    for review in to_update:
+        review.updated_at = now
+    affected = {title_id for title_id, _ in seen}
+    with transaction.atomic():
+        Review.objects.bulk_create(to_create)
+        Review.objects.bulk_update(to_update, ('text', 'score', 'updated_at'))
+        if affected:
+            recalculate_ratings(Title.objects.filter(pk__in=affected))
+            Title.objects.filter(pk__in=affected).update(updated_at=now)
+            index_review_titles(affected)
+    if to_create and to_create[0].pk is None:
+        fill_review_ids(to_create)
+    if affected:
+        invalidate('titles', *(
+            scope for title_id in affected
+            for scope in (f'title:{title_id}', f'reviews:{title_id}')
+        ))
+    return report(
+        [review.pk for review in to_create],
+        [review.pk for review in to_update],
+        errors
+    )
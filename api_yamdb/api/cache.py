@@ -0,0 +1,176 @@
+from calendar import timegm
+from hashlib import md5
+from threading import Lock
+
+from api import replicas
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+
+from api_yamdb.settings import REPLICA_PIN_SECONDS, RESPONSE_CACHE_TTL
+
+
+class CacheStats:
+    def __init__(self):
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def as_dict(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+stats = CacheStats()
+
+
+def scope_key(scope):
+    return f'response:scope:{scope}'
+
+
+def get_versions(scopes):
+    keys = [scope_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: 1 for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def recent_key(scope):
+    return f'response:scope:{scope}:recent'
+
+
+def invalidate(*scopes):
+    """Сбрасывает закешированные ответы, зависящие от указанных областей."""
+    for scope in scopes:
+        try:
+            cache.incr(scope_key(scope))
+        except ValueError:
+            cache.set(scope_key(scope), 1, None)
+    if replicas.REPLICA_DATABASES:
+        cache.set_many(
+            {recent_key(scope): 1 for scope in scopes}, REPLICA_PIN_SECONDS)
+
+
+def may_be_stale(scopes):
+    """Чтение с реплики вскоре после записи в одну из областей scopes.
+
+    Реплика может еще не получить записанное, а ответ попал бы в кеш под
+    новой версией области, поэтому такие ответы не кешируются.
+    """
+    if not replicas.reads_replica():
+        return False
+    return bool(cache.get_many([recent_key(scope) for scope in scopes]))
+
+
+def not_modified(request, etag, last_modified):
+    """Ответ 304, если версия у клиента совпадает с текущей, иначе None."""
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+
+
+class ConditionalGetMixin:
+    """Добавляет ETag и Last-Modified к ответам list и retrieve.
+
+    Версия ресурса берется одним запросом поля updated_at из
+    get_last_modified, поэтому ответ 304 не загружает объекты и не
+    вызывает сериализатор.
+    """
+
+    def get_last_modified(self):
+        return None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return handler(request, *args, **kwargs)
+        etag = quote_etag(md5('{}:{}'.format(
+            request.build_absolute_uri(), last_modified.isoformat()
+        ).encode()).hexdigest())
+        timestamp = timegm(last_modified.utctimetuple())
+        response = not_modified(request, etag, timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    """Кеширует ответы list и retrieve по полному адресу запроса.
+
+    Ключ включает версии областей из get_cache_scopes, поэтому запись
+    в связанные модели сбрасывает кеш увеличением версии области.
+    Вместе с данными хранятся ETag и Last-Modified, так что условный
+    запрос к закешированному ответу обходится без базы данных.
+    """
+    conditional_headers = ('ETag', 'Last-Modified')
+    cache_scopes = ()
+
+    def get_cache_scopes(self):
+        return self.cache_scopes
+
+    def get_cache_key(self, request):
+        versions = get_versions(self.get_cache_scopes())
+        uri = md5(request.build_absolute_uri().encode()).hexdigest()
+        return 'response:{}:{}:{}'.format(
+            self.basename, '.'.join(map(str, versions)), uri)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not RESPONSE_CACHE_TTL:
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        stats.add(hit=entry is not None)
+        if entry is not None:
+            data, headers = entry
+            response = None
+            if 'ETag' in headers:
+                response = not_modified(
+                    request,
+                    headers['ETag'],
+                    parse_http_date_safe(headers['Last-Modified'])
+                )
+            if response is None:
+                response = Response(data)
+            for header, value in headers.items():
+                response[header] = value
+            response['X-Cache'] = 'HIT'
+            return response
+        response = handler(request, *args, **kwargs)
+        if (response.status_code == 200
+                and not may_be_stale(self.get_cache_scopes())):
+            headers = {
+                header: response[header]
+                for header in self.conditional_headers
+                if response.has_header(header)
+            }
+            cache.set(key, (response.data, headers), RESPONSE_CACHE_TTL)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,99 @@
+import csv
+import json
+from collections import defaultdict
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from reviews.models import Genre, GenreTitle, Title
+
+EXPORT_FIELDS = (
+    'id', 'name', 'year', 'description', 'category', 'genre', 'rating',
+    'updated_at',
+)
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+
+def parse_since(value):
+    """Дата или дата со временем в ISO 8601, иначе ValueError.
+
+    Дата без времени означает полночь в текущем часовом поясе.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f'Некорректная дата: {value}')
+        since = datetime.combine(date, time.min)
+    if timezone.is_naive(since):
+        return timezone.make_aware(since)
+    return since
+
+
+def export_titles(since=None, chunk_size=2000):
+    """Генератор произведений с категорией, жанрами и рейтингом.
+
+    Произведения читаются через iterator(chunk_size), жанры догружаются
+    одним запросом на каждую пачку, так что память не зависит от размера
+    каталога.
+    """
+    genres = dict(Genre.objects.values_list('id', 'slug'))
+    queryset = Title.objects.order_by('id').values_list(
+        'id', 'name', 'year', 'description', 'category__slug',
+        'reviews_count', 'score_sum', 'updated_at',
+    )
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield from export_batch(batch, genres)
+            batch = []
+    if batch:
+        yield from export_batch(batch, genres)
+
+
+def export_batch(batch, genres):
+    title_genres = defaultdict(list)
+    for title_id, genre_id in GenreTitle.objects.filter(
+        title_id__in=[row[0] for row in batch]
+    ).order_by('id').values_list('title_id', 'genre_id'):
+        title_genres[title_id].append(genres[genre_id])
+    for (title_id, name, year, description, category, reviews_count,
+         score_sum, updated_at) in batch:
+        yield {
+            'id': title_id,
+            'name': name,
+            'year': year,
+            'description': description,
+            'category': category,
+            'genre': title_genres[title_id],
+            'rating': score_sum / reviews_count if reviews_count else None,
+            'updated_at': updated_at.isoformat(),
+        }
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def render_ndjson(items):
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False) + '\n'
+
+
+def render_csv(items):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for item in items:
+        item['genre'] = ','.join(item['genre'])
+        yield writer.writerow(item[field] for field in EXPORT_FIELDS)
+
+
+RENDERERS = {'ndjson': render_ndjson, 'csv': render_csv}
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
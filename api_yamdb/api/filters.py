@@ -0,0 +1,24 @@
+from django_filters import rest_framework as filters
+from reviews.models import GenreTitle, Title
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+class TitleFilter(filters.FilterSet):
+    genre = CharInFilter(method='filter_genre')
+    category = filters.CharFilter(field_name='category__slug')
+    name = filters.CharFilter(lookup_expr='contains')
+    year = filters.NumberFilter()
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+
+    class Meta:
+        model = Title
+        fields = ('genre', 'category', 'name', 'year')
+
+    def filter_genre(self, queryset, name, value):
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__slug__in=value
+        ).values('title_id'))
@@ -0,0 +1,33 @@
+from api.export import EXPORT_FORMATS, RENDERERS, export_titles, parse_since
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Выгружает каталог произведений в NDJSON или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument(
+            '--since',
+            help='Только произведения, измененные начиная с этой даты')
+        parser.add_argument(
+            '--file', help='Файл для выгрузки, по умолчанию stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as error:
+                raise CommandError(error)
+        lines = RENDERERS[options['output']](
+            export_titles(since, options['chunk_size']))
+        if not options['file']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['file'], 'w', encoding='utf-8',
+                  newline='') as target:
+            target.writelines(lines)
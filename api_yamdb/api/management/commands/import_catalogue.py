@@ -0,0 +1,300 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from io import StringIO
+
+from api.cache import invalidate
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from reviews.rankings import refresh_rankings
+from reviews.ratings import recalculate_ratings
+from reviews.search import index_review_titles, index_titles
+
+# Порядок загрузки и внешние ключи: поле модели -> справочник для
+# перевода slug или username в id. Колонка с именем поля (category)
+# содержит slug или username, колонка с суффиксом _id (category_id) — id.
+SOURCES = (
+    ('users', User, {}),
+    ('categories', Category, {}),
+    ('genres', Genre, {}),
+    ('titles', Title, {'category': Category}),
+    ('genre_titles', GenreTitle, {'title': None, 'genre': Genre}),
+    ('reviews', Review, {'title': None, 'author': User}),
+    ('comments', Comment, {'review': None, 'author': User}),
+)
+LOOKUP_FIELDS = {Category: 'slug', Genre: 'slug', User: 'username'}
+UNUSABLE_PASSWORD = '!'
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8', newline='') as source:
+        if path.endswith(('.jsonl', '.ndjson')):
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(source)
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Не дает auto_now_add затереть даты из файла при bulk_create."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает каталог из CSV или JSONL файлов пачками через '
+        'bulk_create или COPY в PostgreSQL'
+    )
+
+    def add_arguments(self, parser):
+        for name, model, foreign_keys in SOURCES:
+            parser.add_argument(
+                f'--{name.replace("_", "-")}', dest=name, metavar='PATH',
+                help=f'Файл с записями {model._meta.verbose_name_plural}')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--no-copy', action='store_true',
+            help='Не использовать COPY даже в PostgreSQL')
+
+    def handle(self, *args, **options):
+        if not any(options[name] for name, *_ in SOURCES):
+            raise CommandError('Не указан ни один файл для загрузки')
+        self.batch_size = options['batch_size']
+        self.use_copy = (
+            connection.vendor == 'postgresql' and not options['no_copy'])
+        self.lookups = {}
+        imported = []
+
+        for name, model, foreign_keys in SOURCES:
+            if options[name]:
+                self.import_file(name, options[name], model, foreign_keys)
+                imported.append(model)
+
+        if not imported:
+            return
+        if connection.vendor == 'postgresql':
+            self.reset_sequences(imported)
+        if Review in imported:
+            self.stdout.write('Пересчет рейтингов произведений')
+            recalculate_ratings()
+        if Title in imported:
+            index_titles()
+        elif Review in imported:
+            index_review_titles(None)
+        if Title in imported or Review in imported:
+            refresh_rankings(full=True)
+        invalidate('categories', 'genres', 'titles', 'users', 'rankings')
+
+    def get_lookup(self, model):
+        if model not in self.lookups:
+            self.lookups[model] = dict(
+                model.objects.values_list(LOOKUP_FIELDS[model], 'id'))
+        return self.lookups[model]
+
+    def resolve_id(self, value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'ожидался id, получено {value!r}')
+
+    def resolve(self, value, model):
+        """id по значению колонки с именем связи, а не с суффиксом _id.
+
+        Для связей со slug или username значение всегда ищется в
+        справочнике, даже если состоит из цифр.
+        """
+        if model is None:
+            return self.resolve_id(value)
+        try:
+            return self.get_lookup(model)[str(value)]
+        except KeyError:
+            raise ValueError(
+                f'{model._meta.verbose_name} {value!r} не найден')
+
+    def resolve_relation(self, row, field, foreign_keys):
+        value = row.get(field.attname)
+        if value not in (None, ''):
+            return self.resolve_id(value)
+        value = row.get(field.name)
+        if value in (None, ''):
+            return None
+        return self.resolve(value, foreign_keys[field.name])
+
+    def build(self, row, model, foreign_keys, now):
+        values = {}
+        for field in model._meta.concrete_fields:
+            name = field.name
+            if field.is_relation:
+                value = self.resolve_relation(row, field, foreign_keys)
+                if value is not None:
+                    values[field.attname] = value
+                continue
+            if name not in row:
+                continue
+            value = row[name]
+            if value == '' and (field.null or field.primary_key):
+                value = None
+            values[field.attname] = field.to_python(value)
+        obj = model(**values)
+        for field in model._meta.concrete_fields:
+            if (getattr(field, 'auto_now', False)
+                    or getattr(field, 'auto_now_add', False)):
+                if getattr(obj, field.attname) is None:
+                    setattr(obj, field.attname, now)
+        if model is User and not obj.password:
+            obj.password = UNUSABLE_PASSWORD
+        return obj
+
+    def import_file(self, name, path, model, foreign_keys):
+        started = time.monotonic()
+        now = timezone.now()
+        total = skipped = 0
+        batch = []
+        for number, row in enumerate(read_rows(path), start=1):
+            try:
+                batch.append((number, self.build(
+                    row, model, foreign_keys, now)))
+            except (ValueError, TypeError, ValidationError) as error:
+                skipped += 1
+                self.stderr.write(f'{name}, запись {number}: {error}')
+                continue
+            if len(batch) >= self.batch_size:
+                written = self.write(name, model, batch)
+                total += written
+                skipped += len(batch) - written
+                batch = []
+                self.report(name, total, started)
+        if batch:
+            written = self.write(name, model, batch)
+            total += written
+            skipped += len(batch) - written
+        self.report(name, total, started, skipped)
+        if model in LOOKUP_FIELDS:
+            self.lookups.pop(model, None)
+
+    def report(self, name, total, started, skipped=None):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        message = f'{name}: {total} записей, {total / elapsed:.0f} в секунду'
+        if skipped is not None:
+            message = self.style.SUCCESS(
+                f'{message}, пропущено {skipped}')
+        self.stdout.write(message)
+
+    def missing_relations(self, model, batch):
+        """Ошибки записей пачки со ссылками на несуществующие объекты.
+
+        Внешние ключи в базе проверяются только при COMMIT, поэтому
+        id из колонок _id сверяются заранее, одним запросом на связь.
+        """
+        errors = {}
+        for field in model._meta.concrete_fields:
+            if not field.is_relation:
+                continue
+            related = field.related_model
+            existing = set(related.objects.filter(pk__in={
+                getattr(obj, field.attname) for _, obj in batch
+            }).values_list('pk', flat=True))
+            for number, obj in batch:
+                value = getattr(obj, field.attname)
+                if value is not None and value not in existing:
+                    errors.setdefault(number, (
+                        f'{related._meta.verbose_name} с id {value} '
+                        'не найден'))
+        return errors
+
+    def write(self, name, model, batch):
+        """Записывает пачку, возвращает число записанных объектов.
+
+        Если пачка нарушает ограничения базы (повтор id или
+        уникальной пары), записи вставляются по одной, а
+        конфликтующие пропускаются.
+        """
+        errors = self.missing_relations(model, batch)
+        for number, error in errors.items():
+            self.stderr.write(f'{name}, запись {number}: {error}')
+        batch = [(number, obj) for number, obj in batch
+                 if number not in errors]
+        try:
+            with transaction.atomic():
+                self.insert(model, [obj for _, obj in batch])
+        except IntegrityError:
+            pass
+        else:
+            return len(batch)
+        written = 0
+        for number, obj in batch:
+            try:
+                with transaction.atomic():
+                    self.insert(model, [obj])
+            except IntegrityError as error:
+                self.stderr.write(f'{name}, запись {number}: {error}')
+            else:
+                written += 1
+        return written
+
+    def insert(self, model, objs):
+        if not self.use_copy:
+            with keep_auto_now_add(model):
+                model.objects.bulk_create(objs)
+            return
+        # Список колонок COPY общий для пачки: записи с id из файла и
+        # без него загружаются отдельно.
+        for group in (
+            [obj for obj in objs if obj.pk is not None],
+            [obj for obj in objs if obj.pk is None],
+        ):
+            if group:
+                self.copy(model, group)
+
+    def copy(self, model, objs):
+        fields = [
+            field for field in model._meta.concrete_fields
+            if not (field.primary_key and objs[0].pk is None)
+        ]
+        buffer = StringIO()
+        for obj in objs:
+            buffer.write(','.join(
+                self.copy_value(field.get_db_prep_save(
+                    getattr(obj, field.attname), connection))
+                for field in fields
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        columns = ', '.join(
+            connection.ops.quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                'COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+                .format(connection.ops.quote_name(model._meta.db_table),
+                        columns),
+                buffer
+            )
+
+    def copy_value(self, value):
+        if value is None:
+            return '\\N'
+        return '"{}"'.format(str(value).replace('"', '""'))
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,29 @@
+import time
+
+from api.cache import invalidate
+from django.core.management.base import BaseCommand
+from reviews.rankings import refresh_rankings
+
+
+class Command(BaseCommand):
+    help = ('Обновляет рейтинги лучших и обсуждаемых произведений по '
+            'отзывам, добавленным после прошлого запуска')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересчитать рейтинги всех произведений по всем отзывам')
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять обновление с паузой в секундах')
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            updated = refresh_rankings(full=full)
+            invalidate('rankings')
+            self.stdout.write(f'Обновлено произведений: {updated}')
+            if not options['interval']:
+                return
+            full = False
+            time.sleep(options['interval'])
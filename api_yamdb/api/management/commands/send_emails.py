@@ -0,0 +1,87 @@
+import time
+from datetime import timedelta
+
+from api.models import OutgoingEmail
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками через одно соединение'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument(
+            '--retry-delay', type=int, default=60,
+            help='Задержка перед первым повтором в секундах, дальше '
+                 'удваивается с каждой попыткой')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между проверками пустой очереди в секундах')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить все готовые письма и завершиться')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.send_batch(
+                options['batch_size'],
+                options['max_attempts'],
+                options['retry_delay'],
+            )
+            if processed:
+                continue
+            if options['once']:
+                return
+            time.sleep(options['interval'])
+
+    def send_batch(self, batch_size, max_attempts, retry_delay):
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.select_for_update(
+                    skip_locked=True
+                ).filter(
+                    sent_at__isnull=True,
+                    attempts__lt=max_attempts,
+                    next_attempt_at__lte=now,
+                ).order_by('next_attempt_at')[:batch_size]
+            )
+            if not emails:
+                return 0
+
+            sent, failed = [], []
+            connection = get_connection()
+            try:
+                connection.open()
+                for email in emails:
+                    try:
+                        connection.send_messages((email.as_message(),))
+                    except Exception as error:
+                        failed.append((email, error))
+                    else:
+                        sent.append(email.pk)
+            except Exception as error:
+                failed.extend(
+                    (email, error) for email in emails
+                    if email.pk not in sent
+                )
+            finally:
+                connection.close()
+
+            OutgoingEmail.objects.filter(pk__in=sent).update(sent_at=now)
+            for email, error in failed:
+                delay = timedelta(seconds=retry_delay * 2 ** email.attempts)
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    attempts=F('attempts') + 1,
+                    next_attempt_at=now + delay,
+                    last_error=repr(error),
+                )
+
+        self.stdout.write(
+            f'Отправлено: {len(sent)}, ошибок: {len(failed)}')
+        return len(emails)
@@ -0,0 +1,200 @@
+import logging
+import os
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+from threading import Lock
+from time import perf_counter
+
+from api.cache import stats as cache_stats
+from django.db import connections
+from django.http import HttpResponse
+
+from api_yamdb.postgresql_pool.pool import pools
+from api_yamdb.settings import QUERY_BUDGET
+
+logger = logging.getLogger(__name__)
+
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES = (1, 2, 3, 5, 10, 20, 50, 100, 200)
+HISTOGRAMS = (
+    ('request_duration_seconds', 'Время обработки запроса', SECONDS),
+    ('sql_queries', 'Число SQL-запросов за запрос', QUERIES),
+    ('sql_duration_seconds', 'Время SQL-запросов за запрос', SECONDS),
+    ('serialization_duration_seconds', 'Время сериализации ответа', SECONDS),
+)
+PREFIX = 'yamdb_'
+POOL_GAUGES = ('max_size', 'size', 'idle', 'in_use')
+POOL_COUNTERS = ('checkouts', 'waits', 'timeouts', 'discarded')
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.buckets):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    """Гистограммы по маршрутам в памяти процесса."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.clear()
+
+    def clear(self):
+        self.requests = defaultdict(int)
+        self.histograms = {
+            name: defaultdict(lambda bounds=bounds: Histogram(bounds))
+            for name, _, bounds in HISTOGRAMS
+        }
+
+    def observe(self, route, method, status, values):
+        with self.lock:
+            self.requests[(route, method, status)] += 1
+            for name, value in values.items():
+                self.histograms[name][(route, method)].observe(value)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            lines += [
+                f'# HELP {PREFIX}requests_total Число запросов',
+                f'# TYPE {PREFIX}requests_total counter',
+            ]
+            for (route, method, status), count in sorted(
+                    self.requests.items()):
+                lines.append(
+                    f'{PREFIX}requests_total{{route="{route}",'
+                    f'method="{method}",status="{status}"}} {count}')
+            for name, description, _ in HISTOGRAMS:
+                lines += [
+                    f'# HELP {PREFIX}{name} {description}',
+                    f'# TYPE {PREFIX}{name} histogram',
+                ]
+                for (route, method), histogram in sorted(
+                        self.histograms[name].items()):
+                    labels = f'route="{route}",method="{method}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(
+                            f'{PREFIX}{name}_bucket{{{labels},'
+                            f'le="{bound}"}} {count}')
+                    lines += [
+                        f'{PREFIX}{name}_sum{{{labels}}} {histogram.sum}',
+                        f'{PREFIX}{name}_count{{{labels}}} '
+                        f'{histogram.count}',
+                    ]
+        pool_stats = {
+            alias: pool.stats() for alias, pool in sorted(pools.items())
+            if pool.pid == os.getpid()
+        }
+        for name in POOL_GAUGES + POOL_COUNTERS:
+            if not pool_stats:
+                break
+            metric = f'{PREFIX}db_pool_{name}'
+            if name in POOL_COUNTERS:
+                metric += '_total'
+            kind = 'gauge' if name in POOL_GAUGES else 'counter'
+            lines.append(f'# TYPE {metric} {kind}')
+            lines += [
+                f'{metric}{{alias="{alias}"}} {stats[name]}'
+                for alias, stats in pool_stats.items()
+            ]
+        for name, value in cache_stats.as_dict().items():
+            lines += [
+                f'# TYPE {PREFIX}response_cache_{name}_total counter',
+                f'{PREFIX}response_cache_{name}_total {value}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0
+        self.serialization_time = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += perf_counter() - start
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name
+
+
+class MetricsMiddleware:
+    """Время запроса, число и время SQL-запросов по маршрутам."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.metrics = metrics = RequestMetrics()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        route = route_name(request)
+        registry.observe(route, request.method, response.status_code, {
+            'request_duration_seconds': perf_counter() - start,
+            'sql_queries': metrics.queries,
+            'sql_duration_seconds': metrics.sql_time,
+            'serialization_duration_seconds': metrics.serialization_time,
+        })
+        if QUERY_BUDGET and metrics.queries > QUERY_BUDGET:
+            logger.warning(
+                '%s %s (%s): %d SQL-запросов при бюджете %d',
+                request.method, request.path, route, metrics.queries,
+                QUERY_BUDGET
+            )
+        return response
+
+
+class SerializationTimingMixin:
+    """Учитывает в метриках время to_representation сериализаторов view."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        metrics = getattr(self.request, 'metrics', None)
+        if metrics is None:
+            return serializer
+        to_representation = serializer.to_representation
+
+        def timed(instance):
+            start = perf_counter()
+            try:
+                return to_representation(instance)
+            finally:
+                metrics.serialization_time += perf_counter() - start
+
+        serializer.to_representation = timed
+        return serializer
+
+
+def metrics_view(request):
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
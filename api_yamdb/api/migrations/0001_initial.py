@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:25
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(help_text='Тема письма', max_length=255, verbose_name='subject')),
+                ('body', models.TextField(help_text='Текст письма', verbose_name='body')),
+                ('from_email', models.EmailField(help_text='Отправитель', max_length=254, verbose_name='from_email')),
+                ('to', models.EmailField(help_text='Получатель', max_length=254, verbose_name='to')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Дата постановки в очередь', verbose_name='created_at')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Не отправлять раньше этого времени', verbose_name='next_attempt_at')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='Число неудачных попыток отправки', verbose_name='attempts')),
+                ('last_error', models.TextField(blank=True, help_text='Ошибка последней попытки', verbose_name='last_error')),
+                ('sent_at', models.DateTimeField(blank=True, help_text='Дата отправки', null=True, verbose_name='sent_at')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(fields=['sent_at', 'next_attempt_at'], name='outgoing_email_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.core.mail import EmailMessage
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(
+        max_length=255,
+        verbose_name='subject',
+        help_text='Тема письма'
+    )
+    body = models.TextField(
+        verbose_name='body',
+        help_text='Текст письма'
+    )
+    from_email = models.EmailField(
+        verbose_name='from_email',
+        help_text='Отправитель'
+    )
+    to = models.EmailField(
+        verbose_name='to',
+        help_text='Получатель'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='created_at',
+        help_text='Дата постановки в очередь'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='next_attempt_at',
+        help_text='Не отправлять раньше этого времени'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='attempts',
+        help_text='Число неудачных попыток отправки'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='last_error',
+        help_text='Ошибка последней попытки'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='sent_at',
+        help_text='Дата отправки'
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outgoing_email_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.to}: {self.subject[:15]}'
+
+    def as_message(self, connection=None):
+        return EmailMessage(
+            self.subject,
+            self.body,
+            self.from_email,
+            (self.to,),
+            connection=connection,
+        )
@@ -1,5 +1,259 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from hashlib import md5
+
+from api.cache import get_versions, may_be_stale
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import (EmptyPage, InvalidPage, Page,
+                                   PageNotAnInteger, Paginator)
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, PageNumberPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from api_yamdb.settings import (COUNT_CACHE_TTL, COUNT_ESTIMATE_THRESHOLD,
+                                MAX_PAGE_SIZE)
+
+
+def estimate_count(queryset):
+    """Оценка числа строк таблицы по статистике планировщика PostgreSQL."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            (queryset.model._meta.db_table,)
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < COUNT_ESTIMATE_THRESHOLD:
+        return None
+    return int(row[0])
+
+
+class LazyCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class LazyCountPaginator(Paginator):
+    """Paginator, которому для выдачи страницы не нужен COUNT.
+
+    Наличие следующей страницы определяется по лишней записи в выборке,
+    а count считается только по запросу: для таблицы без фильтров берется
+    оценка планировщика, точные значения кешируются на COUNT_CACHE_TTL.
+    """
+    count_key_prefix = ''
+    cache_scopes = ()
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not items and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+        return LazyCountPage(
+            items[:self.per_page], number, self, len(items) > self.per_page)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return len(queryset)
+        if not queryset.query.where and not queryset.query.distinct:
+            estimate = estimate_count(queryset)
+            if estimate is not None:
+                return estimate
+        if not COUNT_CACHE_TTL:
+            return queryset.count()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            # queryset.none() или фильтр по пустому списку
+            return 0
+        key = 'pagination:count:{}:{}'.format(
+            self.count_key_prefix,
+            md5(f'{queryset.db}:{sql}:{params}'.encode()).hexdigest()
+        )
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            if not may_be_stale(self.cache_scopes):
+                cache.set(key, count, COUNT_CACHE_TTL)
+        return count
+
+    def last_page_number(self):
+        """Номер последней страницы по точному числу строк.
+
+        Оценка планировщика и закешированный count могут разойтись с
+        таблицей, и page=last попал бы на пустую страницу.
+        """
+        queryset = self.object_list
+        self.count = (
+            queryset.count() if isinstance(queryset, QuerySet)
+            else len(queryset)
+        )
+        return self.num_pages
+
+
+class KeysetPagination(BasePagination):
+    """Постраничный вывод по ключу сортировки вместо OFFSET.
+
+    Порядок задается атрибутом keyset_ordering у view, курсор хранит
+    значения этих полей у последней записи страницы.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 5
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    invalid_cursor_message = 'Некорректный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = view.keyset_ordering
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict((
+            ('next', self.get_next_link()),
+            ('results', data),
+        )))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        position = [
+            self.get_value(last, field) for field in self.ordering]
+        cursor = urlsafe_b64encode(
+            json.dumps(position, default=str).encode()
+        ).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            cursor,
+        )
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_value(self, item, field):
+        if isinstance(item, dict):
+            return item[field]
+        return getattr(item, field)
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            position = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, BinasciiError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def after(self, position):
+        condition = Q()
+        for index in reversed(range(len(self.ordering))):
+            equal = {
+                field: value for field, value in
+                zip(self.ordering[:index], position[:index])
+            }
+            condition = Q(
+                **equal,
+                **{f'{self.ordering[index]}__gt': position[index]}
+            ) | condition
+        return condition
 
 
 class PostsPagination(PageNumberPagination):
     page_size = 5
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    count_query_param = 'count'
+    django_paginator_class = LazyCountPaginator
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (getattr(view, 'keyset_ordering', None)
+                and KeysetPagination.cursor_query_param
+                in request.query_params):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.with_count = request.query_params.get(
+            self.count_query_param, ''
+        ).lower() not in ('0', 'false', 'no')
+        paginator = self.django_paginator_class(
+            queryset, self.get_page_size(request))
+        if hasattr(view, 'get_cache_scopes'):
+            paginator.cache_scopes = view.get_cache_scopes()
+            paginator.count_key_prefix = '.'.join(
+                map(str, get_versions(paginator.cache_scopes)))
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            page_number = paginator.last_page_number()
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)))
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        fields = [
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]
+        if self.with_count:
+            fields.insert(0, ('count', self.page.paginator.count))
+        return Response(OrderedDict(fields))
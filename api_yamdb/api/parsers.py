@@ -0,0 +1,28 @@
+import codecs
+from io import BytesIO
+
+from api.renderers import FastJSONRenderer, orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson, если он установлен.
+
+    Тело не в UTF-8 и ошибки разбора передаются стандартной реализации,
+    чтобы сообщения об ошибках остались прежними.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if (orjson is None or not self.strict
+                or codecs.lookup(encoding).name != 'utf-8'):
+            return super().parse(stream, media_type, parser_context)
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(
+                BytesIO(content), media_type, parser_context)
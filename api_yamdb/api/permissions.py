@@ -14,7 +14,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
         elif request.user.is_authenticated:
             return (
-                obj.author == request.user
+                obj.author_id == request.user.pk
                 or request.user.is_moderator
                 or request.user.is_admin
             )
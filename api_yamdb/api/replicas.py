@@ -0,0 +1,85 @@
+from hashlib import md5
+from random import choice
+from threading import local
+
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.settings import REPLICA_DATABASES, REPLICA_PIN_SECONDS
+
+PIN_COOKIE = 'replica_pin'
+
+state = local()
+
+
+def reads_replica():
+    """Чтение в текущем запросе идет с реплики."""
+    return getattr(state, 'database', None) not in (None, 'default')
+
+
+def pin_key(request):
+    """Ключ кеша для закрепления клиента за основной базой по токену."""
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    return 'replica:pin:' + md5(authorization.encode()).hexdigest()
+
+
+def is_pinned(request):
+    if request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES:
+        return True
+    key = pin_key(request)
+    return key is not None and cache.get(key) is not None
+
+
+def pin(request, response):
+    """После записи клиент REPLICA_PIN_SECONDS читает из основной базы."""
+    key = pin_key(request)
+    if key is not None:
+        cache.set(key, 1, REPLICA_PIN_SECONDS)
+    response.set_cookie(
+        PIN_COOKIE, '1', max_age=REPLICA_PIN_SECONDS, httponly=True)
+
+
+class ReplicaRouter:
+    """Чтение внутри безопасного запроса — с реплики, остальное — с default.
+
+    Вне запросов (команды, фоновые задачи) реплика не выбрана, и все
+    запросы идут в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return getattr(state, 'database', None) or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in REPLICA_DATABASES
+
+
+class ReplicaMiddleware:
+    """Выбирает реплику для чтения на время запроса.
+
+    Небезопасные запросы и запросы клиента, недавно писавшего в базу,
+    читают из основной базы, чтобы сразу видеть свои изменения.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not REPLICA_DATABASES:
+            return self.get_response(request)
+        state.database = (
+            'default' if is_pinned(request) else choice(REPLICA_DATABASES))
+        try:
+            response = self.get_response(request)
+        finally:
+            state.database = None
+        if request.method not in SAFE_METHODS:
+            pin(request, response)
+        return response
@@ -1,10 +1,14 @@
-from django.db.models import Avg
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+
 from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from reviews.search import render_headline
 
 from api_yamdb.settings import EXC_NAME, MAX_REVIEW_SCORE, MIN_REVIEW_SCORE
 
@@ -50,6 +54,9 @@ class TokenSerializer(TokenObtainPairSerializer):
 
     def get_token(self, user):
         refresh = RefreshToken.for_user(user)
+        refresh['username'] = user.username
+        refresh['role'] = user.role
+        refresh['is_superuser'] = user.is_superuser
         return {
             'token': str(refresh.access_token),
         }
@@ -91,7 +98,7 @@ class TitleSerializerPostPatchDel(serializers.ModelSerializer):
 class TitleSerializerGet(serializers.ModelSerializer):
     genre = GenreSerializer(many=True, read_only=True)
     category = GenreSerializer(many=False, read_only=True)
-    rating = serializers.SerializerMethodField()
+    rating = serializers.ReadOnlyField()
 
     class Meta:
 
@@ -100,10 +107,16 @@ class TitleSerializerGet(serializers.ModelSerializer):
                   'description', 'genre', 'category')
         read_only_fields = ('id', 'rating')
 
-    def get_rating(self, obj):
-        return obj.reviews.all().aggregate(
-            Avg('score')
-        ).get('score__avg')
+
+class TitleSearchSerializer(TitleSerializerGet):
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.SerializerMethodField()
+
+    class Meta(TitleSerializerGet.Meta):
+        fields = TitleSerializerGet.Meta.fields + ('rank', 'headline')
+
+    def get_headline(self, title):
+        return render_headline(title.headline)
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -119,22 +132,9 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = '__all__'
+        fields = ('id', 'author', 'text', 'score', 'pub_date', 'title')
         read_only_fields = ('id', 'pub_date', 'author', 'title',)
 
-    def validate(self, data):
-        title_id = self.context['request'].parser_context['kwargs']['title_id']
-        search_title = get_object_or_404(Title, id=title_id)
-        if self.partial:
-            return data
-        if Review.objects.filter(
-            author=self.context['request'].user,
-            title=search_title,
-        ).exists():
-            raise serializers.ValidationError(
-                'Отзыв пользователя на произведение уже существует')
-        return data
-
     def validate_score(self, value):
         if value > MAX_REVIEW_SCORE or value < MIN_REVIEW_SCORE:
             raise serializers.ValidationError(
@@ -149,5 +149,136 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        fields = ('id', 'author', 'text', 'pub_date', 'review')
         read_only_fields = ('id', 'pub_date', 'author', 'review',)
+
+
+class BulkSlugSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=64)
+    slug = serializers.SlugField(max_length=50)
+
+
+class BulkTitleSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=64)
+    year = serializers.IntegerField(min_value=0, max_value=32767)
+    description = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True)
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField(required=False, allow_null=True)
+
+
+class BulkReviewSerializer(serializers.Serializer):
+    title = serializers.IntegerField()
+    author = serializers.CharField(max_length=150)
+    text = serializers.CharField()
+    score = serializers.IntegerField(
+        min_value=MIN_REVIEW_SCORE, max_value=MAX_REVIEW_SCORE)
+
+
+class ValuesSerializer(ABC):
+    """Сериализатор для чтения строк .values() без создания моделей.
+
+    Вывод совпадает с соответствующим ModelSerializer. values — поля,
+    которые view выбирает из базы, represent строит ответ по одной строке.
+    """
+    values = ()
+
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+
+    def prepare(self, rows):
+        """Дополнительные запросы сразу для всех строк страницы."""
+
+    @abstractmethod
+    def represent(self, row):
+        """Ответ по одной строке .values()."""
+
+    def to_representation(self, instance):
+        rows = list(instance) if self.many else [instance]
+        self.prepare(rows)
+        if self.many:
+            return [self.represent(row) for row in rows]
+        return self.represent(instance)
+
+    @property
+    def data(self):
+        return self.to_representation(self.instance)
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """Чтение в формате TitleSerializerGet; жанры — в порядке связей."""
+    values = (
+        'id', 'name', 'year', 'reviews_count', 'score_sum', 'description',
+        'category__name', 'category__slug',
+    )
+
+    def prepare(self, rows):
+        self.genres = defaultdict(list)
+        for title_id, name, slug in GenreTitle.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).order_by('id').values_list(
+                'title_id', 'genre__name', 'genre__slug'):
+            self.genres[title_id].append(
+                OrderedDict((('name', name), ('slug', slug))))
+
+    def represent(self, row):
+        category = None
+        if row['category__slug'] is not None:
+            category = OrderedDict((
+                ('name', row['category__name']),
+                ('slug', row['category__slug']),
+            ))
+        return OrderedDict((
+            ('id', row['id']),
+            ('name', row['name']),
+            ('year', row['year']),
+            ('rating', (
+                row['score_sum'] / row['reviews_count']
+                if row['reviews_count'] else None)),
+            ('description', row['description']),
+            ('genre', self.genres[row['id']]),
+            ('category', category),
+        ))
+
+
+class RankedTitleValuesSerializer(TitleValuesSerializer):
+    """TitleValuesSerializer с показателем, по которому строится рейтинг."""
+    values = TitleValuesSerializer.values + ('score',)
+
+    def represent(self, row):
+        data = super().represent(row)
+        data['score'] = row['score']
+        return data
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Чтение в формате ReviewSerializer."""
+    values = ('id', 'author__username', 'text', 'score', 'pub_date', 'title')
+    date_field = serializers.DateTimeField()
+
+    def represent(self, row):
+        return OrderedDict((
+            ('id', row['id']),
+            ('author', row['author__username']),
+            ('text', row['text']),
+            ('score', row['score']),
+            ('pub_date', self.date_field.to_representation(row['pub_date'])),
+            ('title', row['title']),
+        ))
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Чтение в формате CommentSerializer."""
+    values = ('id', 'author__username', 'text', 'pub_date', 'review')
+    date_field = serializers.DateTimeField()
+
+    def represent(self, row):
+        return OrderedDict((
+            ('id', row['id']),
+            ('author', row['author__username']),
+            ('text', row['text']),
+            ('pub_date', self.date_field.to_representation(row['pub_date'])),
+            ('review', row['review']),
+        ))
@@ -0,0 +1,96 @@
+from time import time
+
+from api.authentication import mark_user_changed
+from api.cache import invalidate
+from django.core.signals import request_started
+from django.db import connections
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+from api_yamdb.settings import DB_CONN_HEALTH_CHECKS
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    invalidate('categories')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genres(sender, instance, **kwargs):
+    invalidate('genres')
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    invalidate('titles', f'title:{instance.pk}')
+
+
+@receiver((post_save, post_delete), sender=GenreTitle)
+def invalidate_genre_title(sender, instance, **kwargs):
+    invalidate('titles', f'title:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate('titles', f'title:{instance.pk}')
+        return
+    invalidate('titles', *(f'title:{pk}' for pk in pk_set or ()))
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_reviews(sender, instance, **kwargs):
+    invalidate(
+        'titles', f'title:{instance.title_id}',
+        f'reviews:{instance.title_id}'
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    invalidate(f'comments:{instance.review_id}')
+
+
+@receiver(post_save, sender=User)
+def invalidate_users(sender, instance, created, **kwargs):
+    # В закешированные отзывы встроен только username автора
+    previous = getattr(instance, '_previous_username', None)
+    if created or previous is None or previous == instance.username:
+        return
+    invalidate('users')
+
+
+@receiver(pre_save, sender=User)
+def expire_user_tokens(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(
+        'username', 'role', 'is_superuser', 'is_active').first()
+    if previous is None:
+        return
+    if any(getattr(instance, field) != value
+           for field, value in previous.items()):
+        mark_user_changed(instance.pk, int(time()))
+
+
+@receiver(post_delete, sender=User)
+def expire_deleted_user_tokens(sender, instance, **kwargs):
+    mark_user_changed(instance.pk, int(time()))
+
+
+@receiver(request_started)
+def check_db_connections(sender, **kwargs):
+    """Закрывает постоянные соединения, которые оборвались между запросами."""
+    if not DB_CONN_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
@@ -1,6 +1,8 @@
 from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       ReviewViewSet, TitleViewSet, UserViewSet, create_token,
-                       registration_view)
+                       ReviewViewSet, TitleViewSet, UserViewSet,
+                       bulk_categories_view, bulk_genres_view,
+                       bulk_reviews_view, bulk_titles_view, cache_stats_view,
+                       create_token, registration_view)
 from django.urls import include, path
 from rest_framework import routers
 
@@ -27,4 +29,19 @@ urlpatterns = [
     path('v1/auth/token/',
          create_token,
          name='token'),
+    path('v1/cache/stats/',
+         cache_stats_view,
+         name='cache-stats'),
+    path('v1/bulk/categories/',
+         bulk_categories_view,
+         name='bulk-categories'),
+    path('v1/bulk/genres/',
+         bulk_genres_view,
+         name='bulk-genres'),
+    path('v1/bulk/titles/',
+         bulk_titles_view,
+         name='bulk-titles'),
+    path('v1/bulk/reviews/',
+         bulk_reviews_view,
+         name='bulk-reviews'),
 ]
@@ -1,22 +1,77 @@
+from api.bulk import (save_titles, upsert_categories, upsert_genres,
+                      upsert_reviews)
+from api.cache import CachedResponseMixin, ConditionalGetMixin, stats
+from api.export import (CONTENT_TYPES, EXPORT_FORMATS, RENDERERS,
+                        export_titles, parse_since)
+from api.filters import TitleFilter
+from api.metrics import SerializationTimingMixin
+from api.models import OutgoingEmail
 from api.pagination import PostsPagination
 from api.permissions import IsAdmin, IsAdminOrReadOnly, IsOwnerOrReadOnly
 from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, RegistrationSerializer,
-                             ReviewSerializer, TitleSerializerGet,
-                             TitleSerializerPostPatchDel, TokenSerializer,
+                             CommentValuesSerializer, GenreSerializer,
+                             RankedTitleValuesSerializer,
+                             RegistrationSerializer, ReviewSerializer,
+                             ReviewValuesSerializer, TitleSearchSerializer,
+                             TitleSerializerGet, TitleSerializerPostPatchDel,
+                             TitleValuesSerializer, TokenSerializer,
                              UserSerializer)
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import IntegrityError
+from django.db.models import F
+from django.db.models.functions import Power
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, permissions, status, viewsets
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from reviews.models import Category, Genre, Review, Title, User
+from rest_framework.settings import api_settings
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.rankings import review_weight
+from reviews.ratings import score_stats
+from reviews.search import search_titles
 
-from api_yamdb.settings import CONFIRMATION_EMAIL, EXC_NAME
+from api_yamdb.settings import (BULK_MAX_ITEMS, CONFIRMATION_EMAIL, EXC_NAME,
+                                RANKING_MIN_REVIEWS)
 
+# Действия с рейтингами произведений и поле TitleRanking, задающее порядок
+RANKINGS = {'top': 'ranking__rating', 'trending': 'ranking__trending'}
 
-class UserViewSet(viewsets.ModelViewSet):
+
+class ValuesReadMixin:
+    """Действия values_actions отдают строки .values() без ModelSerializer.
+
+    Остальные действия, а также формы browsable API и OPTIONS, которые
+    подменяют метод запроса, работают с моделями и serializer_class.
+    Сериализатор строк выбирает get_values_serializer_class.
+    """
+    values_serializer_class = None
+    values_actions = ('list', 'retrieve')
+
+    def reads_values(self):
+        return (self.action in self.values_actions
+                and self.request.method in permissions.SAFE_METHODS)
+
+    def get_values_serializer_class(self):
+        return self.values_serializer_class
+
+    def get_serializer(self, *args, **kwargs):
+        if self.reads_values():
+            return self.get_values_serializer_class()(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.reads_values():
+            return queryset
+        return queryset.prefetch_related(None).values(
+            *self.get_values_serializer_class().values)
+
+
+class UserViewSet(SerializationTimingMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     pagination_class = PostsPagination
@@ -27,6 +82,9 @@ class UserViewSet(viewsets.ModelViewSet):
 
     def get_object(self):
         username = self.kwargs['username']
+        if username == EXC_NAME and getattr(
+                self.request.user, 'from_token', False):
+            return get_object_or_404(User, pk=self.request.user.pk)
         if username == EXC_NAME:
             return self.request.user
         return super().get_object()
@@ -48,12 +106,12 @@ def registration_view(request):
     data['email'] = user.email
     data['username'] = user.username
     token = default_token_generator.make_token(user)
-    send_mail(
-        'Вам код для входа на сайт Yamdb',
-        f'Пароль: {token}',
-        CONFIRMATION_EMAIL,
-        (user.email,),
-        fail_silently=True)
+    OutgoingEmail.objects.create(
+        subject='Вам код для входа на сайт Yamdb',
+        body=f'Пароль: {token}',
+        from_email=CONFIRMATION_EMAIL,
+        to=user.email,
+    )
 
     return Response(data)
 
@@ -73,7 +131,54 @@ def create_token(request):
                     status=status.HTTP_400_BAD_REQUEST)
 
 
-class CategoryViewSet(mixins.DestroyModelMixin, mixins.CreateModelMixin,
+@api_view(('GET',))
+@permission_classes((permissions.IsAuthenticated, IsAdmin))
+def cache_stats_view(request):
+    return Response(stats.as_dict())
+
+
+def bulk_response(request, save):
+    if not isinstance(request.data, list):
+        raise ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: ['Ожидается список объектов']
+        })
+    if len(request.data) > BULK_MAX_ITEMS:
+        raise ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Не больше {BULK_MAX_ITEMS} объектов за запрос']
+        })
+    result = save(request.data)
+    if result['errors'] and not (result['created'] or result['updated']):
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
+
+
+@api_view(('POST',))
+@permission_classes((permissions.IsAuthenticated, IsAdmin))
+def bulk_categories_view(request):
+    return bulk_response(request, upsert_categories)
+
+
+@api_view(('POST',))
+@permission_classes((permissions.IsAuthenticated, IsAdmin))
+def bulk_genres_view(request):
+    return bulk_response(request, upsert_genres)
+
+
+@api_view(('POST',))
+@permission_classes((permissions.IsAuthenticated, IsAdmin))
+def bulk_titles_view(request):
+    return bulk_response(request, save_titles)
+
+
+@api_view(('POST',))
+@permission_classes((permissions.IsAuthenticated, IsAdmin))
+def bulk_reviews_view(request):
+    return bulk_response(request, upsert_reviews)
+
+
+class CategoryViewSet(SerializationTimingMixin, CachedResponseMixin,
+                      mixins.DestroyModelMixin, mixins.CreateModelMixin,
                       mixins.ListModelMixin, viewsets.GenericViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -82,9 +187,11 @@ class CategoryViewSet(mixins.DestroyModelMixin, mixins.CreateModelMixin,
     pagination_class = PostsPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+    cache_scopes = ('categories',)
 
 
-class GenreViewSet(mixins.DestroyModelMixin, mixins.CreateModelMixin,
+class GenreViewSet(SerializationTimingMixin, CachedResponseMixin,
+                   mixins.DestroyModelMixin, mixins.CreateModelMixin,
                    mixins.ListModelMixin, viewsets.GenericViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
@@ -93,57 +200,231 @@ class GenreViewSet(mixins.DestroyModelMixin, mixins.CreateModelMixin,
     pagination_class = PostsPagination
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
+    cache_scopes = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(SerializationTimingMixin, ValuesReadMixin,
+                   CachedResponseMixin, ConditionalGetMixin,
+                   viewsets.ModelViewSet):
+    values_serializer_class = TitleValuesSerializer
+    values_actions = ('list', 'retrieve') + tuple(RANKINGS)
     permission_classes = (IsAdminOrReadOnly,)
     pagination_class = PostsPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = TitleFilter
+    keyset_ordering = ('id',)
 
     def get_serializer_class(self):
-        if self.action == 'list' or self.action == 'retrieve':
+        if self.action == 'search':
+            return TitleSearchSerializer
+        if self.action in ('list', 'retrieve') + tuple(RANKINGS):
             return TitleSerializerGet
         return TitleSerializerPostPatchDel
 
+    def get_values_serializer_class(self):
+        if self.action in RANKINGS:
+            return RankedTitleValuesSerializer
+        return self.values_serializer_class
+
+    def get_cache_scopes(self):
+        if self.action == 'retrieve':
+            return (f'title:{self.kwargs["pk"]}', 'categories', 'genres')
+        if self.action in RANKINGS:
+            return ('rankings', 'titles', 'categories', 'genres')
+        return ('titles', 'categories', 'genres')
+
+    def get_last_modified(self):
+        if self.action != 'retrieve':
+            return None
+        return Title.objects.filter(
+            pk=self.kwargs['pk']
+        ).values_list('updated_at', flat=True).first()
+
+    @action(
+        detail=False,
+        permission_classes=(permissions.IsAuthenticated, IsAdmin)
+    )
+    def export(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'output': f'Допустимые форматы: {", ".join(EXPORT_FORMATS)}'})
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since = parse_since(since)
+            except ValueError as error:
+                raise ValidationError({'since': str(error)})
+        response = StreamingHttpResponse(
+            RENDERERS[output](export_titles(since)),
+            content_type=CONTENT_TYPES[output]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="titles.{output}"')
+        return response
+
+    @action(detail=False)
+    def search(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': 'Обязательный параметр'})
+        page = self.paginate_queryset(
+            search_titles(text, self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True)
+    def stats(self, request, pk=None):
+        return Response(score_stats(self.get_object().pk))
+
+    @action(detail=False)
+    def top(self, request):
+        return self.ranked_list(request)
+
+    @action(detail=False)
+    def trending(self, request):
+        return self.ranked_list(request)
+
+    def ranked_list(self, request):
+        # Курсор строится по keyset_ordering, а рейтинг упорядочен по score
+        self.keyset_ordering = None
+        return self.list(request)
+
+    def get_min_reviews(self):
+        value = self.request.query_params.get(
+            'min_reviews', RANKING_MIN_REVIEWS)
+        try:
+            value = int(value)
+            if value < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError(
+                {'min_reviews': 'Ожидается неотрицательное целое число'})
+        return value
+
+    def get_ranked_queryset(self):
+        field = RANKINGS[self.action]
+        queryset = Title.objects.filter(**{f'{field}__isnull': False})
+        if self.action == 'top':
+            queryset = queryset.filter(
+                reviews_count__gte=self.get_min_reviews())
+            score = F(field)
+        else:
+            # Сумма весов отзывов, деленная на вес текущего момента
+            score = Power(2, F(field) - review_weight(timezone.now()))
+        return queryset.annotate(score=score).order_by(f'-{field}', 'id')
+
     def get_queryset(self):
-        queryset = Title.objects.all()
-        genre = self.request.query_params.get('genre')
-        category = self.request.query_params.get('category')
-        name = self.request.query_params.get('name')
-        year = self.request.query_params.get('year')
-        if genre is not None:
-            return queryset.filter(genre__slug=genre)
-        if category is not None:
-            return queryset.filter(category__slug=category)
-        if name is not None:
-            return queryset.filter(name__contains=name)
-        if year is not None:
-            return queryset.filter(year=year)
-        return queryset
-
-
-class ReviewViewSet(viewsets.ModelViewSet):
+        if self.action == 'stats':
+            return Title.objects.only('pk')
+        if self.action in RANKINGS:
+            return self.get_ranked_queryset()
+        if self.action not in ('list', 'retrieve', 'search'):
+            return Title.objects.order_by('id')
+        return Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre').defer('search_vector').order_by('id')
+
+
+class ReviewViewSet(SerializationTimingMixin, ValuesReadMixin,
+                    CachedResponseMixin, ConditionalGetMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = (IsOwnerOrReadOnly,)
     pagination_class = PostsPagination
+    keyset_ordering = ('pub_date', 'id')
+
+    def get_cache_scopes(self):
+        return (f'reviews:{self.kwargs["title_id"]}', 'users')
+
+    def get_last_modified(self):
+        if self.action == 'retrieve':
+            queryset = Review.objects.filter(
+                pk=self.kwargs['pk'], title_id=self.kwargs['title_id'])
+        else:
+            queryset = Title.objects.filter(pk=self.kwargs['title_id'])
+        return queryset.values_list('updated_at', flat=True).first()
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, id=self.kwargs['title_id'])
+        return self._title
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'create'):
+            context['title'] = self.get_title()
+        return context
 
     def get_queryset(self):
-        search_title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return search_title.reviews.all()
+        if self.action == 'list':
+            queryset = self.get_title().reviews.all()
+        else:
+            queryset = Review.objects.filter(title_id=self.kwargs['title_id'])
+        return queryset.select_related('author').order_by(
+            *self.keyset_ordering)
 
     def perform_create(self, serializer):
-        search_title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(author=self.request.user, title=search_title)
+        try:
+            serializer.save(author=self.request.user, title=self.get_title())
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=self.request.user, title=self.get_title()
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Отзыв пользователя на произведение уже существует'
+                ]
+            })
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SerializationTimingMixin, ValuesReadMixin,
+                     ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = (IsOwnerOrReadOnly,)
     pagination_class = PostsPagination
+    keyset_ordering = ('pub_date', 'id')
+
+    def get_cache_scopes(self):
+        return (f'comments:{self.kwargs["review_id"]}',)
+
+    def get_last_modified(self):
+        if self.action == 'retrieve':
+            queryset = Comment.objects.filter(
+                pk=self.kwargs['pk'], review_id=self.kwargs['review_id'])
+        else:
+            queryset = Review.objects.filter(
+                pk=self.kwargs['review_id'], title_id=self.kwargs['title_id'])
+        return queryset.values_list('updated_at', flat=True).first()
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id']
+            )
+        return self._review
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'create'):
+            context['review'] = self.get_review()
+        return context
 
     def get_queryset(self):
-        search_review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        return search_review.comments.all()
+        if self.action == 'list':
+            queryset = self.get_review().comments.all()
+        else:
+            queryset = Comment.objects.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id']
+            )
+        return queryset.select_related('author').order_by(
+            *self.keyset_ordering)
 
     def perform_create(self, serializer):
-        search_review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        serializer.save(author=self.request.user, review=search_review)
+        serializer.save(author=self.request.user, review=self.get_review())
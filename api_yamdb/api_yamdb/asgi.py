@@ -0,0 +1,18 @@
+"""
+ASGI config for YaMDb project.
+
+Django 2.2 не умеет ASGI, поэтому WSGI-приложение оборачивается адаптером
+asgiref: каждый запрос обрабатывается в пуле потоков, а цикл событий
+воркера (uvicorn) принимает соединения, пока запросы ждут базу.
+
+Запуск: GUNICORN_WORKER_CLASS=asgi gunicorn -c gunicorn.conf.py
+"""
+
+import os
+
+from asgiref.wsgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+application = WsgiToAsgi(get_wsgi_application())
@@ -0,0 +1,28 @@
+from django.db.backends.postgresql import base
+
+from api_yamdb.postgresql_pool.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Бэкенд PostgreSQL, который берет соединения из пула процесса.
+
+    Закрытие соединения Django возвращает его в пул, поэтому пул
+    используется вместе с CONN_MAX_AGE = 0.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict.get('POOL', {}))
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.acquire(
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params))
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
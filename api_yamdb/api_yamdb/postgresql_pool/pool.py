@@ -0,0 +1,142 @@
+import os
+from collections import deque
+from threading import Condition, Lock
+from time import monotonic
+
+from psycopg2 import OperationalError
+from psycopg2.extensions import (TRANSACTION_STATUS_IDLE,
+                                 TRANSACTION_STATUS_UNKNOWN)
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """Потокобезопасный пул соединений psycopg2 одного процесса.
+
+    Свободные соединения выдаются в порядке LIFO, простоявшее дольше
+    check_interval соединение перед выдачей проверяется запросом SELECT 1.
+    """
+
+    def __init__(self, max_size=10, timeout=10, check_interval=30):
+        self.pid = os.getpid()
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.condition = Condition()
+        self.idle = deque()
+        self.owned = set()
+        self.opening = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.discarded = 0
+
+    def acquire(self, connect):
+        while True:
+            connection, released_at = self.take()
+            if connection is None:
+                return self.open(connect)
+            if (monotonic() - released_at < self.check_interval
+                    or self.is_usable(connection)):
+                return connection
+            self.discard(connection)
+
+    def take(self):
+        deadline = monotonic() + self.timeout
+        with self.condition:
+            while not self.idle and self.size() >= self.max_size:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f'Нет свободных соединений в пуле за {self.timeout} с')
+                self.waits += 1
+                self.condition.wait(remaining)
+            self.checkouts += 1
+            if self.idle:
+                return self.idle.pop()
+            # Место в пуле занимается до подключения, чтобы не превысить
+            # max_size, пока соединение открывается без блокировки.
+            self.opening += 1
+            return None, None
+
+    def open(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.opening -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.opening -= 1
+            self.owned.add(id(connection))
+        return connection
+
+    def release(self, connection):
+        if id(connection) not in self.owned:
+            return
+        status = (
+            TRANSACTION_STATUS_UNKNOWN if connection.closed
+            else connection.get_transaction_status()
+        )
+        if status == TRANSACTION_STATUS_UNKNOWN:
+            self.discard(connection)
+            return
+        if status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except OperationalError:
+                self.discard(connection)
+                return
+        with self.condition:
+            self.idle.append((connection, monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        if not connection.closed:
+            connection.close()
+        with self.condition:
+            self.owned.discard(id(connection))
+            self.discarded += 1
+            self.condition.notify()
+
+    def is_usable(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except OperationalError:
+            return False
+        return True
+
+    def size(self):
+        return len(self.owned) + self.opening
+
+    def stats(self):
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'size': self.size(),
+                'idle': len(self.idle),
+                'in_use': self.size() - len(self.idle),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'discarded': self.discarded,
+            }
+
+
+pools = {}
+pools_lock = Lock()
+
+
+def get_pool(alias, options):
+    """Пул для алиаса базы; после fork воркера создается новый."""
+    with pools_lock:
+        pool = pools.get(alias)
+        if pool is None or pool.pid != os.getpid():
+            pools[alias] = ConnectionPool(**{
+                key.lower(): value for key, value in options.items()})
+        return pools[alias]
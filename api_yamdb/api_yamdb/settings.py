@@ -1,6 +1,8 @@
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -24,11 +26,14 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework_simplejwt',
     'rest_framework',
+    'django_filters',
     'api',
     'reviews',
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -69,9 +74,60 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', default='') == '1',
+    }
+}
+REPLICA_DATABASES = []
+for number, address in enumerate(
+        filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(','))):
+    host, _, port = address.strip().partition(':')
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(alias)
+if REPLICA_DATABASES:
+    DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=10))
+DB_CONN_HEALTH_CHECKS = os.getenv(
+    'DB_CONN_HEALTH_CHECKS', default='1') == '1'
+
+if os.getenv('DB_POOL', default='') == '1':
+    for settings_dict in DATABASES.values():
+        settings_dict.update({
+            'ENGINE': 'api_yamdb.postgresql_pool',
+            'CONN_MAX_AGE': 0,
+            'POOL': {
+                'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default=10)),
+                'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=10)),
+                'CHECK_INTERVAL': float(
+                    os.getenv('DB_POOL_CHECK_INTERVAL', default=30)),
+            },
+        })
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
     }
 }
+# Кеш в памяти процесса не виден другим воркерам gunicorn: сброс версий
+# областей после записи дошел бы только до воркера, принявшего запрос.
+CACHE_SHARED = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
 
 
 # Password validation
@@ -114,10 +170,28 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+JWT_STATELESS = os.getenv('JWT_STATELESS', default='') == '1'
+if JWT_STATELESS and not CACHE_SHARED:
+    # Отметки об изменении пользователя, отзывающие токены, иначе видит
+    # только воркер, в котором пользователь был изменен.
+    raise ImproperlyConfigured(
+        'JWT_STATELESS требует общего кеша: задайте CACHE_BACKEND')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
+        'api.authentication.StatelessJWTAuthentication'
+        if JWT_STATELESS else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 AUTH_USER_MODEL = 'reviews.User'
@@ -126,10 +200,29 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
+    # Отметка об изменении пользователя в кеше может быть вытеснена, а
+    # queryset.update() ее не ставит, поэтому токены с ролью живут недолго.
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv(
+        'JWT_ACCESS_TOKEN_MINUTES',
+        default=15 if JWT_STATELESS else 7 * 24 * 60))),
 }
 
 EXC_NAME = 'me'
 CONFIRMATION_EMAIL = 'confirmation@yamdb.com'
 MIN_REVIEW_SCORE = 1
 MAX_REVIEW_SCORE = 10
+MAX_PAGE_SIZE = 100
+COUNT_CACHE_TTL = int(os.getenv(
+    'COUNT_CACHE_TTL', default=30 if CACHE_SHARED else 0))
+COUNT_ESTIMATE_THRESHOLD = int(
+    os.getenv('COUNT_ESTIMATE_THRESHOLD', default=100000))
+RESPONSE_CACHE_TTL = int(os.getenv(
+    'RESPONSE_CACHE_TTL', default=60 if CACHE_SHARED else 0))
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', default=1000))
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', default='russian')
+SEARCH_REVIEWS = os.getenv('SEARCH_REVIEWS', default='') == '1'
+SEARCH_HEADLINE_OPTIONS = 'MaxFragments=2'
+QUERY_BUDGET = int(os.getenv('QUERY_BUDGET', default=30))
+RANKING_PRIOR_REVIEWS = int(os.getenv('RANKING_PRIOR_REVIEWS', default=10))
+RANKING_MIN_REVIEWS = int(os.getenv('RANKING_MIN_REVIEWS', default=1))
+RANKING_HALF_LIFE_DAYS = float(os.getenv('RANKING_HALF_LIFE_DAYS', default=7))
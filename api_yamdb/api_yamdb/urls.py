@@ -1,3 +1,4 @@
+from api.metrics import metrics_view
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
@@ -10,4 +11,5 @@ urlpatterns = [
         TemplateView.as_view(template_name='redoc.html'),
         name='redoc'
     ),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,64 @@
+"""Настройки gunicorn из переменных окружения.
+
+GUNICORN_WORKER_CLASS выбирает модель воркеров: gthread (по умолчанию),
+sync, gevent или asgi — приложение из api_yamdb.asgi под воркерами uvicorn.
+"""
+import multiprocessing
+import os
+import sys
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'gevent': 'gevent',
+    'asgi': 'uvicorn.workers.UvicornWorker',
+}
+APPLICATIONS = {
+    'asgi': 'api_yamdb.asgi:application',
+}
+
+mode = os.getenv('GUNICORN_WORKER_CLASS', default='gthread')
+if mode not in WORKER_CLASSES:
+    raise ValueError(
+        f'GUNICORN_WORKER_CLASS: {mode}, ожидается одно из '
+        f'{", ".join(WORKER_CLASSES)}')
+cpus = multiprocessing.cpu_count()
+
+wsgi_app = APPLICATIONS.get(mode, 'api_yamdb.wsgi:application')
+worker_class = WORKER_CLASSES[mode]
+bind = os.getenv('GUNICORN_BIND', default='0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', default=cpus * 2 + 1))
+threads = int(os.getenv(
+    'GUNICORN_THREADS', default=4 if mode == 'gthread' else 1))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', default=100))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', default=30))
+graceful_timeout = timeout
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', default=5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', default=1000))
+max_requests_jitter = int(os.getenv(
+    'GUNICORN_MAX_REQUESTS_JITTER', default=max_requests // 10))
+# Модули, загруженные в мастере до monkey patching gevent, держали бы
+# обычные threading.local и блокировки, общие для всех гринлетов воркера.
+preload_app = os.getenv(
+    'GUNICORN_PRELOAD',
+    default='1' if mode in ('sync', 'gthread') else '0') == '1'
+
+if mode == 'gevent':
+    # Постоянные соединения гринлетов не переиспользуются и копятся
+    # до сборки мусора, поэтому по умолчанию соединения закрываются
+    # после запроса (или берутся из пула с DB_POOL=1).
+    os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+
+def pre_fork(server, worker):
+    # Соединения, открытые при загрузке приложения в мастере, не должны
+    # достаться воркерам: один сокет на несколько процессов ломает протокол.
+    if 'django.db' in sys.modules:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_fork(server, worker):
+    if mode == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -1,8 +1,44 @@
+from api.pagination import LazyCountPaginator
 from django.contrib import admin
+from django.db.models import Q
 from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
 
 
+class AdminPaginator(LazyCountPaginator):
+    count_key_prefix = 'admin'
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist большой таблицы без COUNT всей таблицы на каждой странице.
+
+    Связанные объекты из list_display выбираются через
+    list_select_related. Поиск по search_ids идет в два шага: сначала
+    по индексам связанных таблиц находятся их id (поле, модель и lookup
+    в каждой тройке), затем таблица фильтруется по внешним ключам
+    (title_id IN (...)) без соединений в условии. search_fields при
+    этом только включают строку поиска в changelist.
+    """
+    paginator = AdminPaginator
+    show_full_result_count = False
+    search_ids = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not self.search_ids or not term:
+            return super().get_search_results(
+                request, queryset, search_term)
+        condition = Q()
+        for field, model, lookup in self.search_ids:
+            ids = list(model.objects.filter(
+                **{lookup: term}).values_list('pk', flat=True))
+            if ids:
+                condition |= Q(**{f'{field}__in': ids})
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), False
+
+
 class CategoryAdmin(admin.ModelAdmin):
     list_display = (
         'pk',
@@ -12,14 +48,20 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ('name', 'slug')
 
 
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(LargeTableAdmin):
     list_display = (
         'pk',
         'review',
         'author',
         'pub_date',
     )
-    search_fields = ('review', 'author')
+    list_select_related = ('review', 'author')
+    raw_id_fields = ('review', 'author')
+    search_fields = ('^review__title__name', '=author__username')
+    search_ids = (
+        ('review__title_id', Title, 'name__istartswith'),
+        ('author_id', User, 'username'),
+    )
 
 
 class GenreAdmin(admin.ModelAdmin):
@@ -31,26 +73,38 @@ class GenreAdmin(admin.ModelAdmin):
     search_fields = ('name', 'slug',)
 
 
-class GenreTitleAdmin(admin.ModelAdmin):
+class GenreTitleAdmin(LargeTableAdmin):
     list_display = (
         'pk',
         'genre',
         'title',
     )
-    search_fields = ('genre', 'title',)
+    list_select_related = ('genre', 'title')
+    raw_id_fields = ('genre', 'title')
+    search_fields = ('^title__name', '=genre__slug')
+    search_ids = (
+        ('title_id', Title, 'name__istartswith'),
+        ('genre_id', Genre, 'slug'),
+    )
 
 
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(LargeTableAdmin):
     list_display = (
         'pk',
         'author',
         'title',
         'score',
     )
-    search_fields = ('author', 'title',)
+    list_select_related = ('author', 'title')
+    raw_id_fields = ('author', 'title')
+    search_fields = ('^title__name', '=author__username')
+    search_ids = (
+        ('title_id', Title, 'name__istartswith'),
+        ('author_id', User, 'username'),
+    )
 
 
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(LargeTableAdmin):
     list_display = (
         'pk',
         'name',
@@ -59,7 +113,7 @@ class TitleAdmin(admin.ModelAdmin):
     search_fields = ('name', 'year',)
 
 
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(LargeTableAdmin):
     list_display = (
         'pk',
         'username',
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reviews.ratings import recalculate_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги и гистограммы оценок по всем отзывам'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recalculate_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано произведений: {updated}'))
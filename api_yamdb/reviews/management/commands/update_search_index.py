@@ -0,0 +1,44 @@
+import time
+
+from api.cache import invalidate
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reviews.search import index_pending_titles, index_titles
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pending', action='store_true',
+            help='Переиндексировать только произведения из очереди, '
+                 'отзывы которых изменились')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval', type=float,
+            help='С --pending: проверять очередь с паузой в секундах')
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            self.index_pending(options['batch_size'], options['interval'])
+            return
+        with transaction.atomic():
+            updated = index_titles()
+        if updated is None:
+            self.stdout.write(self.style.SUCCESS(
+                'Индекс в памяти будет построен при первом поиске'))
+            return
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано произведений: {updated}'))
+
+    def index_pending(self, batch_size, interval):
+        while True:
+            updated = index_pending_titles(batch_size)
+            if updated:
+                invalidate('titles')
+                self.stdout.write(f'Проиндексировано произведений: {updated}')
+                continue
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:16
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_rating_counters(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        reviews_count=Coalesce(Subquery(
+            reviews.annotate(total=Count('pk')).values('total'),
+            output_field=IntegerField()
+        ), 0),
+        score_sum=Coalesce(Subquery(
+            reviews.annotate(total=Sum('score')).values('total'),
+            output_field=IntegerField()
+        ), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_auto_20220313_1223'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, help_text='Количество отзывов на произведение', verbose_name='reviews_count'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Сумма оценок произведения', verbose_name='score_sum'),
+        ),
+        migrations.RunPython(fill_rating_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:17
+
+from django.db import migrations, models
+
+
+def create_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS title_name_trgm_idx '
+        'ON reviews_title USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS title_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_rating_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genre_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.RunPython(
+            create_name_trigram_index, drop_name_trigram_index),
+    ]
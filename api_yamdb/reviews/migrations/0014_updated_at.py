@@ -0,0 +1,32 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Дата изменения комментария', verbose_name='updated_at'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Дата изменения оценки или комментариев к ней', verbose_name='updated_at'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Дата изменения произведения или его отзывов', verbose_name='updated_at'),
+            preserve_default=False,
+        ),
+    ]
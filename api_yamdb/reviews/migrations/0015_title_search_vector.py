@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:32
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+from api_yamdb.settings import SEARCH_CONFIG
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS title_search_idx '
+        'ON reviews_title USING gin (search_vector)'
+    )
+    # Текст отзывов добавит команда update_search_index.
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.using(schema_editor.connection.alias).update(
+        search_vector=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        )
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS title_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Полнотекстовый индекс названия, описания и отзывов', null=True, verbose_name='search_vector'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
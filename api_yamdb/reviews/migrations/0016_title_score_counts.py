@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleScoreCount = apps.get_model('reviews', 'TitleScoreCount')
+    TitleScoreCount.objects.bulk_create((
+        TitleScoreCount(title_id=row['title'], score=row['score'],
+                        count=row['count'])
+        for row in Review.objects.order_by().values(
+            'title', 'score').annotate(count=Count('pk'))
+    ), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_title_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(help_text='Оценка', verbose_name='score')),
+                ('count', models.PositiveIntegerField(default=0, help_text='Количество отзывов с этой оценкой', verbose_name='count')),
+                ('title', models.ForeignKey(help_text='Произведение', on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.Title', verbose_name='title')),
+            ],
+            options={
+                'verbose_name': 'Число оценок',
+                'verbose_name_plural': 'Числа оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
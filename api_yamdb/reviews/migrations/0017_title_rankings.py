@@ -0,0 +1,47 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_title_score_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_review_id', models.PositiveIntegerField(default=0, help_text='Последний учтенный в рейтинге отзыв', verbose_name='last_review_id')),
+                ('mean', models.FloatField(help_text='Средняя оценка по всем отзывам при обновлении', null=True, verbose_name='mean')),
+                ('refreshed_at', models.DateTimeField(help_text='Начало последнего обновления рейтинга', null=True, verbose_name='refreshed_at')),
+            ],
+            options={
+                'verbose_name': 'Состояние рейтинга',
+                'verbose_name_plural': 'Состояние рейтинга',
+            },
+        ),
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('title', models.OneToOneField(help_text='Произведение', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='reviews.Title', verbose_name='title')),
+                ('rating', models.FloatField(help_text='Байесовская средняя оценка', null=True, verbose_name='rating')),
+                ('trending', models.FloatField(help_text='Двоичный логарифм суммы весов отзывов по дате публикации', null=True, verbose_name='trending')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Места в рейтинге',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-rating', 'title'], name='ranking_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-trending', 'title'], name='ranking_trending_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-18 09:40
+
+from django.db import migrations
+
+
+def create_name_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # istartswith в PostgreSQL: UPPER("name"::text) LIKE UPPER('...%')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS title_name_upper_idx '
+        'ON reviews_title (UPPER(name::text) text_pattern_ops)'
+    )
+
+
+def drop_name_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS title_name_upper_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0017_title_rankings'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_name_prefix_index, drop_name_prefix_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-18 09:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0018_title_name_prefix_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSearchIndex',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.ForeignKey(help_text='Произведение, отзывы которого изменились после индексации', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.Title', verbose_name='title')),
+            ],
+            options={
+                'verbose_name': 'Ожидает индексации',
+                'verbose_name_plural': 'Ожидают индексации',
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from api_yamdb.settings import MAX_REVIEW_SCORE, MIN_REVIEW_SCORE
 
@@ -141,14 +142,44 @@ class Title(models.Model):
         verbose_name='category',
         help_text='Категория произведения'
     )
+    reviews_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='reviews_count',
+        help_text='Количество отзывов на произведение'
+    )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='score_sum',
+        help_text='Сумма оценок произведения'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='updated_at',
+        help_text='Дата изменения произведения или его отзывов'
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='search_vector',
+        help_text='Полнотекстовый индекс названия, описания и отзывов'
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            models.Index(fields=('year',), name='title_year_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.reviews_count:
+            return None
+        return self.score_sum / self.reviews_count
+
 
 class GenreTitle(models.Model):
     title = models.ForeignKey(
@@ -169,9 +200,13 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'Жанр-Заголовок'
         verbose_name_plural = 'Жанры-Заголовки'
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'), name='genre_title_idx'),
+        )
 
     def __str__(self):
-        return f'{self.title[:15]} - {self.genre[:15]}'
+        return f'{self.title.name[:15]} - {self.genre.name[:15]}'
 
 
 class Review(models.Model):
@@ -206,6 +241,11 @@ class Review(models.Model):
         verbose_name='publication_date',
         help_text='Дата публикации оценки'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='updated_at',
+        help_text='Дата изменения оценки или комментариев к ней'
+    )
 
     class Meta:
         verbose_name = 'Оценка'
@@ -216,10 +256,126 @@ class Review(models.Model):
                 name='unique_author_title'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'), name='review_keyset_idx'),
+        )
 
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class TitleScoreCount(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name='title',
+        help_text='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(
+        verbose_name='score',
+        help_text='Оценка'
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='count',
+        help_text='Количество отзывов с этой оценкой'
+    )
+
+    class Meta:
+        verbose_name = 'Число оценок'
+        verbose_name_plural = 'Числа оценок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='unique_title_score'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} x {self.count}'
+
+
+class TitleRanking(models.Model):
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='ranking',
+        verbose_name='title',
+        help_text='Произведение'
+    )
+    rating = models.FloatField(
+        null=True,
+        verbose_name='rating',
+        help_text='Байесовская средняя оценка'
+    )
+    trending = models.FloatField(
+        null=True,
+        verbose_name='trending',
+        help_text='Двоичный логарифм суммы весов отзывов по дате публикации'
+    )
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтинге'
+        indexes = (
+            models.Index(
+                fields=('-rating', 'title'), name='ranking_rating_idx'),
+            models.Index(
+                fields=('-trending', 'title'), name='ranking_trending_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.title_id}: {self.rating}'
+
+
+class RankingState(models.Model):
+    last_review_id = models.PositiveIntegerField(
+        default=0,
+        verbose_name='last_review_id',
+        help_text='Последний учтенный в рейтинге отзыв'
+    )
+    mean = models.FloatField(
+        null=True,
+        verbose_name='mean',
+        help_text='Средняя оценка по всем отзывам при обновлении'
+    )
+    refreshed_at = models.DateTimeField(
+        null=True,
+        verbose_name='refreshed_at',
+        help_text='Начало последнего обновления рейтинга'
+    )
+
+    class Meta:
+        verbose_name = 'Состояние рейтинга'
+        verbose_name_plural = 'Состояние рейтинга'
+
+    def __str__(self):
+        return f'{self.last_review_id}: {self.refreshed_at}'
+
+
+class PendingSearchIndex(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='title',
+        help_text='Произведение, отзывы которого изменились после индексации'
+    )
+
+    class Meta:
+        verbose_name = 'Ожидает индексации'
+        verbose_name_plural = 'Ожидают индексации'
+
+    def __str__(self):
+        return str(self.title_id)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -245,10 +401,21 @@ class Comment(models.Model):
         verbose_name='publication_date',
         help_text='Дата публикации комментария'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='updated_at',
+        help_text='Дата изменения комментария'
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_keyset_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:15]
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from math import log2
+
+from django.db import transaction
+from django.db.models import Max, Q, Sum
+from django.utils import timezone
+from reviews.models import RankingState, Review, Title, TitleRanking
+
+from api_yamdb.settings import RANKING_HALF_LIFE_DAYS, RANKING_PRIOR_REVIEWS
+
+EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+BATCH_SIZE = 500
+# Сдвиг средней оценки, после которого байесовский рейтинг пересчитывается
+# у всех произведений, а не только у изменившихся.
+MEAN_TOLERANCE = 0.01
+
+
+def review_weight(moment):
+    """Двоичный логарифм веса отзыва, опубликованного в момент moment.
+
+    Вес удваивается каждые RANKING_HALF_LIFE_DAYS, поэтому сумма весов
+    отзывов, деленная на вес текущего момента, — число отзывов с
+    затуханием: отзыв давностью в период полураспада считается за половину.
+    Порядок по сумме весов от времени не зависит, и ее можно накапливать.
+    """
+    return (moment - EPOCH) / timedelta(days=RANKING_HALF_LIFE_DAYS)
+
+
+def add_weights(first, second):
+    """log2(2 ** first + 2 ** second) без переполнения float."""
+    if first is None:
+        return second
+    high, low = max(first, second), min(first, second)
+    return high + log2(1 + 2 ** (low - high))
+
+
+def trending_weights(reviews):
+    weights = {}
+    for title_id, pub_date in reviews.values_list(
+            'title_id', 'pub_date').iterator():
+        weights[title_id] = add_weights(
+            weights.get(title_id), review_weight(pub_date))
+    return weights
+
+
+def mean_score():
+    totals = Title.objects.aggregate(
+        count=Sum('reviews_count'), total=Sum('score_sum'))
+    if not totals['count']:
+        return None
+    return totals['total'] / totals['count']
+
+
+def mean_changed(previous, current):
+    if previous is None or current is None:
+        return previous != current
+    return abs(current - previous) > MEAN_TOLERANCE
+
+
+def bayesian_rating(score_sum, reviews_count, mean):
+    """Средняя оценка, к которой добавлено RANKING_PRIOR_REVIEWS средних."""
+    if mean is None:
+        return None
+    return ((RANKING_PRIOR_REVIEWS * mean + score_sum)
+            / (RANKING_PRIOR_REVIEWS + reviews_count))
+
+
+def save_rankings(titles, weights, mean, replace):
+    """Записывает рейтинги произведений titles пачками по BATCH_SIZE.
+
+    Веса из weights заменяют накопленные при replace, иначе добавляются
+    к ним.
+    """
+    rows = titles.order_by('pk').values_list(
+        'pk', 'score_sum', 'reviews_count').iterator()
+    saved = 0
+    while True:
+        batch = list(islice(rows, BATCH_SIZE))
+        if not batch:
+            return saved
+        existing = TitleRanking.objects.in_bulk([row[0] for row in batch])
+        to_create, to_update = [], []
+        for title_id, score_sum, reviews_count in batch:
+            ranking = existing.get(title_id)
+            if ranking is None:
+                ranking = TitleRanking(title_id=title_id)
+                to_create.append(ranking)
+            else:
+                to_update.append(ranking)
+            ranking.rating = bayesian_rating(score_sum, reviews_count, mean)
+            weight = weights.get(title_id)
+            if replace:
+                ranking.trending = weight
+            elif weight is not None:
+                ranking.trending = add_weights(ranking.trending, weight)
+        TitleRanking.objects.bulk_create(to_create)
+        TitleRanking.objects.bulk_update(to_update, ('rating', 'trending'))
+        saved += len(batch)
+
+
+def refresh_rankings(full=False):
+    """Обновляет TitleRanking и возвращает число обновленных произведений.
+
+    Без full к весам добавляются только отзывы новее последнего учтенного,
+    а байесовский рейтинг пересчитывается по счетчикам у произведений,
+    изменившихся с прошлого обновления. Удаленные отзывы и исправленные
+    даты учитываются полным пересчетом.
+    """
+    started = timezone.now()
+    with transaction.atomic():
+        state, created = RankingState.objects.select_for_update(
+        ).get_or_create(pk=1)
+        full = full or created or state.refreshed_at is None
+        last_review_id = Review.objects.aggregate(
+            last=Max('pk'))['last'] or 0
+        mean = mean_score()
+        reviews = Review.objects.filter(pk__lte=last_review_id).order_by()
+        titles = Title.objects.all()
+        if full:
+            weights = trending_weights(reviews)
+        else:
+            weights = trending_weights(
+                reviews.filter(pk__gt=state.last_review_id))
+            if not mean_changed(state.mean, mean):
+                titles = titles.filter(
+                    Q(updated_at__gte=state.refreshed_at)
+                    | Q(pk__in=list(weights)))
+        state.last_review_id = last_review_id
+        state.mean = mean
+        state.refreshed_at = started
+        state.save()
+        return save_rankings(titles, weights, mean, replace=full)
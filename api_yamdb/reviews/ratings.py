@@ -0,0 +1,109 @@
+from collections import OrderedDict
+
+from django.db import connections, router
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from reviews.models import Review, Title, TitleScoreCount
+
+from api_yamdb.settings import MAX_REVIEW_SCORE, MIN_REVIEW_SCORE
+
+
+def update_rating(title_id, count_delta, score_delta):
+    Title.objects.filter(pk=title_id).update(
+        reviews_count=F('reviews_count') + count_delta,
+        score_sum=F('score_sum') + score_delta,
+        updated_at=timezone.now(),
+    )
+
+
+def update_score_count(title_id, score, delta):
+    """Меняет на delta число отзывов с оценкой score у произведения."""
+    if delta < 0:
+        TitleScoreCount.objects.filter(
+            title_id=title_id, score=score
+        ).update(count=F('count') + delta)
+        return
+    # Вставка с обновлением при конфликте (PostgreSQL и SQLite 3.24+)
+    # не теряет строку, одновременно созданную другой транзакцией.
+    connection = connections[router.db_for_write(TitleScoreCount)]
+    table = connection.ops.quote_name(TitleScoreCount._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (title_id, score, count) '
+            'VALUES (%s, %s, %s) ON CONFLICT (title_id, score) '
+            f'DO UPDATE SET count = {table}.count + excluded.count',
+            (title_id, score, delta)
+        )
+
+
+def recalculate_score_counts(titles=None):
+    """Пересобирает гистограммы оценок по таблице отзывов."""
+    counts = TitleScoreCount.objects.all()
+    reviews = Review.objects.order_by()
+    if titles is not None:
+        counts = counts.filter(title__in=titles)
+        reviews = reviews.filter(title__in=titles)
+    counts.delete()
+    TitleScoreCount.objects.bulk_create((
+        TitleScoreCount(
+            title_id=row['title'], score=row['score'], count=row['count'])
+        for row in reviews.values('title', 'score').annotate(
+            count=Count('pk'))
+    ), batch_size=500)
+
+
+def recalculate_ratings(titles=None):
+    """Пересчитывает количество, сумму и гистограмму оценок по отзывам."""
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    queryset = Title.objects.all() if titles is None else titles
+    recalculate_score_counts(titles)
+    return queryset.update(
+        reviews_count=Coalesce(Subquery(
+            reviews.annotate(total=Count('pk')).values('total'),
+            output_field=IntegerField()
+        ), 0),
+        score_sum=Coalesce(Subquery(
+            reviews.annotate(total=Sum('score')).values('total'),
+            output_field=IntegerField()
+        ), 0),
+    )
+
+
+def score_stats(title_id):
+    """Число отзывов, среднее, медиана и гистограмма оценок произведения.
+
+    Читает не больше MAX_REVIEW_SCORE строк счетчиков, сколько бы отзывов
+    ни было у произведения.
+    """
+    counts = dict(TitleScoreCount.objects.filter(
+        title_id=title_id).values_list('score', 'count'))
+    histogram = OrderedDict(
+        (score, counts.get(score, 0))
+        for score in range(MIN_REVIEW_SCORE, MAX_REVIEW_SCORE + 1))
+    total = sum(histogram.values())
+    return OrderedDict((
+        ('count', total),
+        ('mean', (
+            sum(score * count for score, count in histogram.items()) / total
+            if total else None)),
+        ('median', median(histogram, total)),
+        ('histogram', histogram),
+    ))
+
+
+def median(histogram, total):
+    if not total:
+        return None
+    # Оценки на позициях (total - 1) // 2 и следующей в упорядоченном ряду
+    middle = []
+    seen = 0
+    for score, count in histogram.items():
+        seen += count
+        while len(middle) < 2 and seen > (total - 1) // 2 + len(middle):
+            middle.append(score)
+    if total % 2:
+        return middle[0]
+    return (middle[0] + middle[1]) / 2
@@ -0,0 +1,255 @@
+import re
+from collections import defaultdict
+from collections.abc import Sequence
+from threading import Lock
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db import connection, transaction
+from django.db.models import F, Func, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils.html import escape
+from reviews.models import PendingSearchIndex, Review, Title
+
+from api_yamdb.settings import (SEARCH_CONFIG, SEARCH_HEADLINE_OPTIONS,
+                                SEARCH_REVIEWS)
+
+# Веса как у ts_rank по умолчанию для меток A, B и C.
+WEIGHTS = {'name': 1.0, 'description': 0.4, 'reviews': 0.2}
+WORD = re.compile(r'\w+')
+# Границы найденных слов в headline до экранирования текста
+START_SEL, STOP_SEL = '\x02', '\x03'
+
+
+class RegConfig(Func):
+    template = '%(expressions)s::regconfig'
+
+
+class Headline(Func):
+    """ts_headline: фрагменты документа с подсвеченными словами запроса."""
+    function = 'ts_headline'
+    output_field = TextField()
+
+    def __init__(self, expression, query, options=SEARCH_HEADLINE_OPTIONS):
+        options = f'StartSel={START_SEL}, StopSel={STOP_SEL}, {options}'
+        super().__init__(
+            RegConfig(Value(SEARCH_CONFIG)), expression, query, Value(options))
+
+
+def tokenize(text):
+    return WORD.findall((text or '').lower())
+
+
+def highlight(text, words):
+    return WORD.sub(
+        lambda match: (
+            f'{START_SEL}{match.group()}{STOP_SEL}'
+            if match.group().lower() in words else match.group()
+        ),
+        text.replace(START_SEL, '').replace(STOP_SEL, '')
+    )
+
+
+def render_headline(headline):
+    """HTML фрагмента: текст экранирован, найденные слова выделены <b>."""
+    if headline is None:
+        return None
+    return escape(headline).replace(START_SEL, '<b>').replace(
+        STOP_SEL, '</b>')
+
+
+def title_vector():
+    vector = (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+    if not SEARCH_REVIEWS:
+        return vector
+    texts = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title').annotate(
+        text=StringAgg('text', ' ')
+    ).values('text')
+    return vector + SearchVector(
+        Subquery(texts, output_field=TextField()),
+        weight='C', config=SEARCH_CONFIG
+    )
+
+
+def title_documents(titles):
+    documents = {
+        pk: {'name': name, 'description': description}
+        for pk, name, description in titles.values_list(
+            'pk', 'name', 'description')
+    }
+    if SEARCH_REVIEWS:
+        reviews = defaultdict(list)
+        for title_id, text in Review.objects.filter(
+                title_id__in=documents).values_list('title_id', 'text'):
+            reviews[title_id].append(text)
+        for title_id, texts in reviews.items():
+            documents[title_id]['reviews'] = ' '.join(texts)
+    return documents
+
+
+class InvertedIndex:
+    """Поисковый индекс в памяти процесса для баз без tsvector.
+
+    Строится целиком при первом поиске, дальше обновляется сигналами.
+    Слова не нормализуются, кроме приведения к нижнему регистру.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.clear()
+
+    def clear(self):
+        self.ready = False
+        self.postings = defaultdict(dict)
+        self.words = {}
+
+    def add(self, pk, document):
+        weights = defaultdict(float)
+        for field, text in document.items():
+            for word in tokenize(text):
+                weights[word] += WEIGHTS[field]
+        self.remove(pk)
+        for word, weight in weights.items():
+            self.postings[word][pk] = weight
+        self.words[pk] = tuple(weights)
+
+    def remove(self, pk):
+        for word in self.words.pop(pk, ()):
+            self.postings[word].pop(pk, None)
+            if not self.postings[word]:
+                del self.postings[word]
+
+    def update(self, titles, pks=None):
+        with self.lock:
+            documents = title_documents(titles)
+            for pk in set(pks or ()) - set(documents):
+                self.remove(pk)
+            for pk, document in documents.items():
+                self.add(pk, document)
+            if pks is None:
+                self.ready = True
+
+    def search(self, words):
+        if not self.ready:
+            self.update(Title.objects.all())
+        with self.lock:
+            postings = [self.postings.get(word, {}) for word in words]
+            if not postings or not all(postings):
+                return []
+            matches = [
+                (sum(posting[pk] for posting in postings), pk)
+                for pk in min(postings, key=len)
+                if all(pk in posting for posting in postings)
+            ]
+        return sorted(matches, key=lambda match: (-match[0], match[1]))
+
+
+index = InvertedIndex()
+
+
+class IndexResults(Sequence):
+    """Выдача индекса: произведения читаются из базы только для среза."""
+
+    def __init__(self, matches, words, queryset):
+        self.matches = matches
+        self.words = words
+        self.queryset = queryset
+
+    def __len__(self):
+        return len(self.matches)
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        matches = self.matches[item]
+        titles = self.queryset.in_bulk([pk for _, pk in matches])
+        page = []
+        for rank, pk in matches:
+            if pk not in titles:
+                continue
+            title = titles[pk]
+            title.rank = rank
+            title.headline = highlight(
+                f'{title.name}. {title.description or ""}', self.words)
+            page.append(title)
+        return page
+
+
+def index_titles(pks=None):
+    """Обновляет поисковый индекс указанных или всех произведений."""
+    titles = Title.objects.all()
+    if pks is not None:
+        titles = titles.filter(pk__in=pks)
+    if connection.vendor == 'postgresql':
+        return titles.update(search_vector=title_vector())
+    if pks is None:
+        index.clear()
+    elif index.ready:
+        index.update(titles, pks)
+    return None
+
+
+def defer_review_indexing():
+    # Индекс в памяти живет в процессе веб-сервера, задача его не увидит
+    return connection.vendor == 'postgresql'
+
+
+def index_review_titles(pks):
+    """Учитывает в индексе изменившиеся отзывы произведений.
+
+    Вектор произведения собирается из текста всех его отзывов, поэтому
+    в PostgreSQL запись отзыва только ставит произведение в очередь, а
+    индекс пересчитывает пачками update_search_index --pending.
+    """
+    if not SEARCH_REVIEWS:
+        return
+    if pks is None or not defer_review_indexing():
+        index_titles(pks)
+        return
+    PendingSearchIndex.objects.bulk_create(
+        PendingSearchIndex(title_id=pk) for pk in pks)
+
+
+def index_pending_titles(batch_size):
+    """Переиндексирует пачку произведений из очереди, возвращает их число."""
+    with transaction.atomic():
+        pending = list(PendingSearchIndex.objects.select_for_update(
+            skip_locked=True
+        ).order_by('pk').values_list('pk', 'title_id')[:batch_size])
+        if not pending:
+            return 0
+        titles = {title_id for _, title_id in pending}
+        index_titles(titles)
+        # Отзывы, записанные во время индексации, оставили новые записи
+        PendingSearchIndex.objects.filter(
+            pk__in=[pk for pk, _ in pending]).delete()
+    return len(titles)
+
+
+def unindex_title(pk):
+    if connection.vendor != 'postgresql':
+        with index.lock:
+            index.remove(pk)
+
+
+def search_titles(text, queryset=None):
+    """Произведения по запросу, от более релевантных к менее."""
+    queryset = Title.objects.all() if queryset is None else queryset
+    if connection.vendor != 'postgresql':
+        words = tokenize(text)
+        return IndexResults(index.search(words), set(words), queryset)
+    query = SearchQuery(text, config=SEARCH_CONFIG)
+    document = Concat(
+        F('name'), Value('. '), Coalesce(F('description'), Value('')),
+        output_field=TextField()
+    )
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query),
+        headline=Headline(document, query),
+    ).order_by('-rank', 'id')
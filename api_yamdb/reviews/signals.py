@@ -0,0 +1,127 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from reviews.ratings import update_rating, update_score_count
+from reviews.search import index_review_titles, index_titles, unindex_title
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    instance._previous = None
+    if instance.pk is None:
+        return
+    instance._previous = Review.objects.select_for_update().filter(
+        pk=instance.pk
+    ).values('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def count_review_score(sender, instance, created, **kwargs):
+    if created:
+        update_rating(instance.title_id, 1, instance.score)
+        update_score_count(instance.title_id, instance.score, 1)
+        return
+    previous = getattr(instance, '_previous', None)
+    if previous is None:
+        update_rating(instance.title_id, 0, 0)
+        return
+    if previous['title_id'] != instance.title_id:
+        update_rating(previous['title_id'], -1, -previous['score'])
+        update_rating(instance.title_id, 1, instance.score)
+    else:
+        update_rating(
+            instance.title_id, 0, instance.score - previous['score'])
+    if (previous['title_id'], previous['score']) != (
+            instance.title_id, instance.score):
+        update_score_count(previous['title_id'], previous['score'], -1)
+        update_score_count(instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Review)
+def discount_review_score(sender, instance, **kwargs):
+    update_rating(instance.title_id, -1, -instance.score)
+    update_score_count(instance.title_id, instance.score, -1)
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def touch_review(sender, instance, **kwargs):
+    Review.objects.filter(pk=instance.review_id).update(
+        updated_at=timezone.now())
+
+
+def touch_titles(titles):
+    Title.objects.filter(pk__in=titles).update(updated_at=timezone.now())
+
+
+# updated_at произведений и отзывов — версия их ответов API (ETag,
+# Last-Modified) и выгрузки с since, поэтому меняется и вместе со
+# встроенными в ответ категорией, жанрами и username авторов.
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, **kwargs):
+    touch_titles(Title.objects.filter(category=instance).values('pk'))
+
+
+@receiver(post_save, sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    touch_titles(GenreTitle.objects.filter(genre=instance).values('title_id'))
+
+
+@receiver((post_save, post_delete), sender=GenreTitle)
+def touch_genre_title(sender, instance, **kwargs):
+    touch_titles((instance.title_id,))
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def touch_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            touch_titles((instance.pk,))
+    elif action == 'pre_clear':
+        touch_genre_titles(Genre, instance)
+    elif action.startswith('post_'):
+        touch_titles(pk_set or ())
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._previous_username = None
+    if instance.pk is not None:
+        instance._previous_username = User.objects.filter(
+            pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def touch_user_posts(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_username', None)
+    if created or previous is None or previous == instance.username:
+        return
+    now = timezone.now()
+    Review.objects.filter(author=instance).update(updated_at=now)
+    Review.objects.filter(
+        pk__in=Comment.objects.filter(author=instance).values('review_id')
+    ).update(updated_at=now)
+    Comment.objects.filter(author=instance).update(updated_at=now)
+    touch_titles(Review.objects.filter(author=instance).values('title_id'))
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    index_titles((instance.pk,))
+
+
+@receiver(post_delete, sender=Title)
+def remove_title_from_index(sender, instance, **kwargs):
+    unindex_title(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=Review)
+def index_review_text(sender, instance, **kwargs):
+    titles = {instance.title_id}
+    previous = getattr(instance, '_previous', None)
+    if previous is not None:
+        titles.add(previous['title_id'])
+    index_review_titles(titles)
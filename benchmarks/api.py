@@ -0,0 +1,183 @@
+"""Задержка и число SQL-запросов основных эндпоинтов API.
+
+По умолчанию запросы идут через тестовый клиент Django к отдельной
+тестовой базе, заполненной benchmarks.dataset. С --url запросы уходят
+по HTTP к запущенному серверу (например, gunicorn), а его база должна
+быть заранее заполнена командой python -m benchmarks.seed.
+"""
+import argparse
+import json
+import os
+from random import Random
+from time import perf_counter
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from benchmarks.common import (print_results, save_results, setup_django,
+                               summarize)
+from benchmarks.dataset import seed
+
+SCENARIOS = (
+    'title-list', 'title-detail', 'review-list', 'review-create',
+    'comment-list',
+)
+WRITER = 'bench_writer'
+
+
+class InProcessClient:
+    def __init__(self):
+        from rest_framework.test import APIClient
+        self.client = APIClient()
+
+    def request(self, method, path, data=None, token=None):
+        from api.metrics import RequestMetrics
+        from django.db import connection
+
+        headers = {}
+        if token:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        metrics = RequestMetrics()
+        with connection.execute_wrapper(metrics):
+            start = perf_counter()
+            response = getattr(self.client, method.lower())(
+                path, data, format='json', **headers)
+            elapsed = perf_counter() - start
+        return response.status_code, elapsed, metrics.queries
+
+
+class HttpClient:
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        body = None if data is None else json.dumps(data).encode()
+        request = Request(
+            self.url + path, data=body, headers=headers, method=method)
+        start = perf_counter()
+        try:
+            with urlopen(request) as response:
+                response.read()
+                status = response.status
+        except HTTPError as error:
+            status = error.code
+        return status, perf_counter() - start, None
+
+
+def targets(rng):
+    """Объекты для сценариев: самые популярные отзыв и произведение."""
+    from django.db.models import Count
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from reviews.models import Review, Title, User
+
+    writer, _ = User.objects.get_or_create(
+        username=WRITER, defaults={'email': f'{WRITER}@yamdb.fake'})
+    title_ids = list(Title.objects.values_list('pk', flat=True))
+    review = Review.objects.annotate(
+        comments_total=Count('comments')
+    ).order_by('-comments_total', 'pk').values('pk', 'title_id').first()
+    return {
+        'token': str(RefreshToken.for_user(writer).access_token),
+        'title_ids': title_ids,
+        'popular_title': Title.objects.order_by(
+            '-reviews_count', 'pk').values_list('pk', flat=True).first(),
+        'review': review,
+        'unreviewed': list(Title.objects.exclude(
+            reviews__author=writer).order_by('pk').values_list(
+                'pk', flat=True)),
+        'rng': rng,
+    }
+
+
+def plan(scenario, number, target):
+    """Метод, путь, тело и токен number-го запроса сценария."""
+    page = number % 50 + 1
+    if scenario == 'title-list':
+        return 'GET', f'/api/v1/titles/?page={page}', None, None
+    if scenario == 'title-detail':
+        title_id = target['rng'].choice(target['title_ids'])
+        return 'GET', f'/api/v1/titles/{title_id}/', None, None
+    if scenario == 'review-list':
+        return 'GET', (
+            f'/api/v1/titles/{target["popular_title"]}/reviews/'
+            f'?page={page}'), None, None
+    if scenario == 'review-create':
+        title_id = target['unreviewed'].pop(0)
+        return 'POST', f'/api/v1/titles/{title_id}/reviews/', {
+            'text': 'Отзыв из бенчмарка', 'score': number % 10 + 1,
+        }, target['token']
+    review = target['review']
+    return 'GET', (
+        f'/api/v1/titles/{review["title_id"]}/reviews/{review["pk"]}'
+        f'/comments/?page={page}'), None, None
+
+
+def run(client, scenario, iterations, warmup, target):
+    if scenario == 'review-create':
+        iterations = min(
+            iterations, len(target['unreviewed']) - warmup)
+    timings, queries, statuses = [], [], []
+    for number in range(warmup + iterations):
+        method, path, data, token = plan(scenario, number, target)
+        status, elapsed, count = client.request(method, path, data, token)
+        if number < warmup:
+            continue
+        timings.append(elapsed)
+        statuses.append(status)
+        if count is not None:
+            queries.append(count)
+    return summarize(timings, queries, statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--comments-per-review', type=int, default=1)
+    parser.add_argument('--skew', type=float, default=1.1)
+    parser.add_argument('--seed', type=int, default=2022)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument(
+        '--scenario', action='append', choices=SCENARIOS,
+        help='Можно указать несколько раз, по умолчанию все')
+    parser.add_argument('--url', help='Адрес запущенного сервера')
+    parser.add_argument(
+        '--keepdb', action='store_true',
+        help='Не пересоздавать тестовую базу между запусками')
+    parser.add_argument(
+        '--no-cache', action='store_true', help='Отключить кеш ответов')
+    parser.add_argument('--output', help='Файл для JSON с результатами')
+    options = parser.parse_args()
+
+    if options.no_cache:
+        os.environ['RESPONSE_CACHE_TTL'] = '0'
+    setup_django(test_database=not options.url, keepdb=options.keepdb)
+    parameters = {
+        key: value for key, value in vars(options).items()
+        if key not in ('output', 'scenario', 'keepdb')
+    }
+    if not options.url:
+        from reviews.models import Title
+
+        if not Title.objects.exists():
+            parameters['dataset'] = seed(
+                options.titles, options.users, options.reviews_per_title,
+                options.comments_per_review, options.skew, options.seed)
+    client = HttpClient(options.url) if options.url else InProcessClient()
+    target = targets(Random(options.seed))
+    results = {
+        scenario: run(
+            client, scenario, options.iterations, options.warmup, target)
+        for scenario in options.scenario or SCENARIOS
+    }
+    print_results(results)
+    print('Результаты:', save_results('api', parameters, results,
+                                      options.output))
+
+
+if __name__ == '__main__':
+    main()
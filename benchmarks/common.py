@@ -0,0 +1,112 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from math import ceil
+from os.path import abspath, dirname, join
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+RESULTS_DIR = join(ROOT_DIR, 'benchmarks', 'results')
+
+
+def setup_django(test_database=True, keepdb=False):
+    """Настраивает Django; по умолчанию на отдельной тестовой базе.
+
+    Без DB_ENGINE в окружении, как и в тестах, используется SQLite в
+    памяти, иначе создается тестовая база рядом с настроенной.
+    """
+    sys.path.insert(0, join(ROOT_DIR, 'api_yamdb'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+
+    if test_database and 'DB_ENGINE' not in os.environ:
+        settings.DATABASES = {
+            'default': {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': ':memory:',
+            }
+        }
+    django.setup()
+    if test_database:
+        from django.db import connection
+        connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(timings, queries, statuses):
+    """Сводка по одному сценарию: перцентили в миллисекундах и запросы."""
+    if not timings:
+        return {'requests': 0}
+    milliseconds = [timing * 1000 for timing in timings]
+    summary = {
+        'requests': len(timings),
+        'mean_ms': round(sum(milliseconds) / len(milliseconds), 3),
+        'p50_ms': round(percentile(milliseconds, 0.50), 3),
+        'p95_ms': round(percentile(milliseconds, 0.95), 3),
+        'p99_ms': round(percentile(milliseconds, 0.99), 3),
+        'statuses': {
+            str(status): statuses.count(status)
+            for status in sorted(set(statuses))
+        },
+    }
+    if queries:
+        summary['queries_mean'] = round(sum(queries) / len(queries), 2)
+        summary['queries_max'] = max(queries)
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            cwd=ROOT_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import django
+    from django.db import connection
+
+    return {
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+    }
+
+
+def save_results(name, parameters, results, path=None):
+    """Сохраняет результаты в JSON и возвращает путь к файлу."""
+    report = {
+        'benchmark': name,
+        'environment': environment(),
+        'parameters': parameters,
+        'results': results,
+    }
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = report['environment']['commit'] or 'local'
+        path = join(RESULTS_DIR, f'{name}-{commit}.json')
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(report, output, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_results(
+        results, columns=('p50_ms', 'p95_ms', 'p99_ms', 'queries_mean')):
+    print(f'{"":24}' + ''.join(f'{column:>14}' for column in columns))
+    for scenario, summary in results.items():
+        print(f'{scenario:24}' + ''.join(
+            f'{summary.get(column, "-"):>14}' for column in columns))
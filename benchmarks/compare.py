@@ -0,0 +1,73 @@
+"""Сравнивает два JSON с результатами бенчмарков и ищет регрессии."""
+import argparse
+import json
+import sys
+
+LATENCY = ('p50_ms', 'p95_ms', 'p99_ms')
+QUERIES = ('queries_mean', 'queries_max')
+THROUGHPUT = ('throughput_rps',)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)
+
+
+def compare(baseline, current, threshold):
+    """Строки сравнения и число регрессий.
+
+    Задержка считается регрессией, если выросла больше чем на threshold,
+    пропускная способность — если упала больше чем на threshold,
+    число SQL-запросов — при любом росте.
+    """
+    rows, regressions = [], 0
+    for scenario, before in baseline['results'].items():
+        after = current['results'].get(scenario)
+        if after is None:
+            continue
+        for metric in LATENCY + QUERIES + THROUGHPUT:
+            if before.get(metric) is None or after.get(metric) is None:
+                continue
+            old, new = before[metric], after[metric]
+            change = (new - old) / old if old else 0
+            if metric in THROUGHPUT:
+                regression = new < old * (1 - threshold)
+            else:
+                limit = threshold if metric in LATENCY else 0
+                regression = new > old * (1 + limit)
+            regressions += regression
+            rows.append((
+                scenario, metric, old, new, change,
+                'РЕГРЕССИЯ' if regression else ''))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='Допустимый рост задержки, доля (по умолчанию 0.1)')
+    options = parser.parse_args()
+
+    baseline, current = load(options.baseline), load(options.current)
+    print(f'{baseline["environment"]["commit"]} -> '
+          f'{current["environment"]["commit"]}')
+    changed = sorted(
+        key for key in set(baseline['parameters']) | set(
+            current['parameters'])
+        if baseline['parameters'].get(key)
+        != current['parameters'].get(key)
+    )
+    if changed:
+        print(f'Параметры запусков различаются: {", ".join(changed)}')
+    rows, regressions = compare(baseline, current, options.threshold)
+    for scenario, metric, old, new, change, mark in rows:
+        print(f'{scenario:24}{metric:14}{old:>12}{new:>12}'
+              f'{change:>+10.1%}  {mark}')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from random import Random
+
+WORDS = (
+    'война', 'мир', 'любовь', 'город', 'море', 'дорога', 'семья', 'тайна',
+    'время', 'звезда', 'ночь', 'солнце', 'история', 'сердце', 'песня',
+    'зима', 'лето', 'остров', 'король', 'память', 'дом', 'огонь', 'вода',
+)
+CATEGORIES = 5
+GENRES = 20
+START = datetime(2020, 1, 1)
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def review_counts(titles, total, skew, limit):
+    """Число отзывов по произведениям с убыванием по закону Ципфа."""
+    weights = [1 / (rank + 1) ** skew for rank in range(titles)]
+    scale = total / sum(weights)
+    return [min(limit, round(weight * scale)) for weight in weights]
+
+
+def ids(model):
+    return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+def seed(titles=1000, users=None, reviews_per_title=10,
+         comments_per_review=1, skew=1.1, random_seed=2022,
+         batch_size=500):
+    """Заполняет пустую базу одинаковым для одних параметров каталогом."""
+    from api.management.commands.import_catalogue import keep_auto_now_add
+    from django.db import transaction
+    from django.utils import timezone
+    from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                                Title, User)
+    from reviews.ratings import recalculate_ratings
+    from reviews.search import index_titles
+
+    if Title.objects.exists():
+        raise RuntimeError('Каталог в базе не пуст')
+    rng = Random(random_seed)
+    users = users or max(100, titles // 2)
+    start = timezone.make_aware(START, timezone.utc)
+
+    with transaction.atomic():
+        User.objects.bulk_create((
+            User(username=f'bench_{number}',
+                 email=f'bench_{number}@yamdb.fake', password='!')
+            for number in range(users)
+        ), batch_size=batch_size)
+        user_ids = ids(User)[-users:]
+        Category.objects.bulk_create(
+            Category(name=f'Категория {number}', slug=f'category_{number}')
+            for number in range(CATEGORIES))
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre_{number}')
+            for number in range(GENRES))
+        category_ids, genre_ids = ids(Category), ids(Genre)
+
+        Title.objects.bulk_create((
+            Title(
+                name=text(rng, 3), year=rng.randrange(1900, 2023),
+                description=text(rng, 20),
+                category_id=rng.choice(category_ids))
+            for _ in range(titles)
+        ), batch_size=batch_size)
+        title_ids = ids(Title)
+        GenreTitle.objects.bulk_create((
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in rng.sample(genre_ids, rng.randint(1, 3))
+        ), batch_size=batch_size)
+
+        counts = review_counts(
+            titles, titles * reviews_per_title, skew, users)
+        with keep_auto_now_add(Review):
+            Review.objects.bulk_create((
+                Review(
+                    title_id=title_id, author_id=author_id,
+                    text=text(rng, 30), score=rng.randint(1, 10),
+                    pub_date=start + timedelta(
+                        minutes=rng.randrange(60 * 24 * 365)))
+                for title_id, count in zip(title_ids, counts)
+                for author_id in rng.sample(user_ids, count)
+            ), batch_size=batch_size)
+        review_ids = ids(Review)
+        weights = [
+            1 / (rank + 1) ** skew for rank in range(len(review_ids))]
+        with keep_auto_now_add(Comment):
+            Comment.objects.bulk_create((
+                Comment(
+                    review_id=review_id, author_id=rng.choice(user_ids),
+                    text=text(rng, 10),
+                    pub_date=start + timedelta(
+                        minutes=rng.randrange(60 * 24 * 365)))
+                for review_id in rng.choices(
+                    review_ids, weights,
+                    k=len(review_ids) * comments_per_review)
+            ), batch_size=batch_size)
+
+        recalculate_ratings()
+        index_titles()
+    return {
+        'users': users,
+        'titles': titles,
+        'reviews': len(review_ids),
+        'comments': len(review_ids) * comments_per_review,
+    }
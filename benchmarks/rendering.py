@@ -0,0 +1,111 @@
+"""Время кодирования и разбора JSON для больших страниц API.
+
+Сравнивает стандартные JSONRenderer и JSONParser DRF с FastJSONRenderer и
+FastJSONParser из api на странице произведений и странице отзывов
+размером --page-size. Без установленного orjson быстрые классы
+используют стандартную реализацию, и разница будет нулевой.
+"""
+import argparse
+from collections import OrderedDict
+from io import BytesIO
+from time import perf_counter
+
+from benchmarks.common import (print_results, save_results, setup_django,
+                               summarize)
+from benchmarks.dataset import seed
+
+
+def pages(page_size):
+    """Данные страниц в том виде, в каком их отдают view."""
+    from api.serializers import ReviewSerializer, TitleSerializerGet
+    from reviews.models import Review, Title
+
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre').defer('search_vector').order_by('id')[:page_size]
+    title_id = Title.objects.order_by(
+        '-reviews_count', 'pk').values_list('pk', flat=True).first()
+    reviews = Review.objects.filter(title_id=title_id).select_related(
+        'author').order_by('pub_date', 'id')[:page_size]
+    return {
+        'titles': TitleSerializerGet(titles, many=True).data,
+        'reviews': ReviewSerializer(reviews, many=True).data,
+    }
+
+
+def paginated(results):
+    return OrderedDict((
+        ('count', len(results)), ('next', None), ('previous', None),
+        ('results', results),
+    ))
+
+
+def measure(function, argument, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = perf_counter()
+        function(argument)
+        timings.append(perf_counter() - start)
+    return summarize(timings, [], [])
+
+
+def codecs():
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    return {
+        'json': (JSONRenderer(), JSONParser()),
+        'fast': (FastJSONRenderer(), FastJSONParser()),
+    }
+
+
+def run(data, iterations):
+    results = {}
+    for page, results_page in data.items():
+        content = paginated(results_page)
+        expected = None
+        for name, (renderer, parser) in codecs().items():
+            rendered = renderer.render(content)
+            if expected is None:
+                expected = rendered
+            elif rendered != expected:
+                raise AssertionError(f'{name}: ответ {page} отличается')
+            summary = measure(renderer.render, content, iterations)
+            summary['bytes'] = len(rendered)
+            results[f'{page}-render-{name}'] = summary
+            results[f'{page}-parse-{name}'] = measure(
+                lambda body: parser.parse(BytesIO(body)), rendered,
+                iterations)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=2022)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--output', help='Файл для JSON с результатами')
+    options = parser.parse_args()
+
+    setup_django()
+    from api.renderers import orjson
+
+    parameters = {
+        key: value for key, value in vars(options).items()
+        if key != 'output'
+    }
+    parameters['orjson'] = getattr(orjson, '__version__', None)
+    parameters['dataset'] = seed(
+        options.titles, reviews_per_title=options.reviews_per_title,
+        random_seed=options.seed)
+    results = run(pages(options.page_size), options.iterations)
+    print_results(results, ('p50_ms', 'p95_ms', 'p99_ms', 'bytes'))
+    print('Результаты:', save_results('rendering', parameters, results,
+                                      options.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""Заполняет настроенную базу каталогом для бенчмарков через HTTP."""
+import argparse
+
+from benchmarks.common import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--comments-per-review', type=int, default=1)
+    parser.add_argument('--skew', type=float, default=1.1)
+    parser.add_argument('--seed', type=int, default=2022)
+    options = parser.parse_args()
+
+    setup_django(test_database=False)
+    from benchmarks.dataset import seed
+
+    print(seed(
+        options.titles, options.users, options.reviews_per_title,
+        options.comments_per_review, options.skew, options.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Чтение страниц через ModelSerializer и через строки .values().
+
+Для страниц произведений, отзывов и комментариев размером --page-size
+замеряется выборка из базы вместе с сериализацией тем же запросом, что
+строят view, и число страниц в секунду. Ответы обоих вариантов
+сравниваются побайтно.
+"""
+import argparse
+
+from benchmarks.common import print_results, save_results, setup_django
+from benchmarks.dataset import seed
+from benchmarks.rendering import measure
+
+COLUMNS = ('pages_per_second', 'p50_ms', 'p95_ms', 'p99_ms')
+
+
+def readers(page_size):
+    """Функции, строящие данные страницы каждым из вариантов."""
+    from api import serializers
+    from django.db.models import Count
+    from reviews.models import Comment, Review, Title
+
+    title_id = Title.objects.order_by(
+        '-reviews_count', 'pk').values_list('pk', flat=True).first()
+    review_id = Review.objects.annotate(
+        comments_total=Count('comments')
+    ).order_by('-comments_total', 'pk').values_list('pk', flat=True).first()
+    querysets = {
+        'titles': Title.objects.select_related('category').prefetch_related(
+            'genre').defer('search_vector').order_by('id'),
+        'reviews': Review.objects.filter(title_id=title_id).select_related(
+            'author').order_by('pub_date', 'id'),
+        'comments': Comment.objects.filter(review_id=review_id).select_related(
+            'author').order_by('pub_date', 'id'),
+    }
+    classes = {
+        'titles': (
+            serializers.TitleSerializerGet,
+            serializers.TitleValuesSerializer),
+        'reviews': (
+            serializers.ReviewSerializer, serializers.ReviewValuesSerializer),
+        'comments': (
+            serializers.CommentSerializer,
+            serializers.CommentValuesSerializer),
+    }
+
+    def model(page):
+        model_class = classes[page][0]
+        return lambda _: model_class(
+            querysets[page][:page_size], many=True).data
+
+    def values(page):
+        values_class = classes[page][1]
+        return lambda _: values_class(
+            querysets[page].prefetch_related(None).values(
+                *values_class.values)[:page_size],
+            many=True).data
+
+    return {
+        page: {'model': model(page), 'values': values(page)}
+        for page in querysets
+    }
+
+
+def run(pages, iterations):
+    from rest_framework.renderers import JSONRenderer
+
+    results = {}
+    for page, variants in pages.items():
+        expected = None
+        for name, read in variants.items():
+            content = JSONRenderer().render(read(None))
+            if expected is None:
+                expected = content
+            elif content != expected:
+                raise AssertionError(f'{name}: страница {page} отличается')
+            summary = measure(read, None, iterations)
+            summary['pages_per_second'] = round(1000 / summary['mean_ms'], 1)
+            results[f'{page}-{name}'] = summary
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--comments-per-review', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=2022)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--output', help='Файл для JSON с результатами')
+    options = parser.parse_args()
+
+    setup_django()
+    parameters = {
+        key: value for key, value in vars(options).items()
+        if key != 'output'
+    }
+    parameters['dataset'] = seed(
+        options.titles, reviews_per_title=options.reviews_per_title,
+        comments_per_review=options.comments_per_review,
+        random_seed=options.seed)
+    results = run(readers(options.page_size), options.iterations)
+    print_results(results, COLUMNS)
+    print('Результаты:', save_results('serializers', parameters, results,
+                                      options.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Пропускная способность и задержка API в разных моделях воркеров gunicorn.
+
+Для каждого режима GUNICORN_WORKER_CLASS запускается gunicorn с
+api_yamdb/gunicorn.conf.py, и на него параллельно отправляются запросы
+на чтение из сценариев benchmarks.api. Без DB_ENGINE в окружении база —
+временный файл SQLite, заполненный benchmarks.dataset, иначе используется
+настроенная база, заполненная командой python -m benchmarks.seed.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from os.path import join
+from random import Random
+from tempfile import mkdtemp
+from time import monotonic, perf_counter, sleep
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from benchmarks.api import HttpClient, plan, targets
+from benchmarks.common import (ROOT_DIR, print_results, save_results,
+                               setup_django, summarize)
+from benchmarks.dataset import seed
+
+MODES = ('sync', 'gthread', 'gevent', 'asgi')
+REQUIREMENTS = {
+    'gevent': ('gevent', 'psycogreen'),
+    'asgi': ('uvicorn',),
+}
+READS = ('title-list', 'title-detail', 'review-list')
+COLUMNS = ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms')
+
+
+def available(mode):
+    modules = ('gunicorn',) + REQUIREMENTS.get(mode, ())
+    return all(find_spec(module) for module in modules)
+
+
+def prepare_database(options):
+    """Настраивает Django на базу, общую с запускаемыми серверами."""
+    if 'DB_ENGINE' in os.environ:
+        setup_django(test_database=False)
+        return None
+    os.environ.update({
+        'DB_ENGINE': 'django.db.backends.sqlite3',
+        'DB_NAME': join(mkdtemp(), 'serving.sqlite3'),
+    })
+    setup_django(test_database=False)
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    return seed(
+        options.titles, options.users, options.reviews_per_title,
+        options.comments_per_review, options.skew, options.seed)
+
+
+def start_server(mode, options):
+    environment = {
+        **os.environ,
+        'GUNICORN_WORKER_CLASS': mode,
+        'GUNICORN_BIND': f'127.0.0.1:{options.port}',
+        'GUNICORN_WORKERS': str(options.workers),
+    }
+    if options.threads:
+        environment['GUNICORN_THREADS'] = str(options.threads)
+    if options.no_cache:
+        environment['RESPONSE_CACHE_TTL'] = '0'
+    return subprocess.Popen(
+        (sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'),
+        cwd=join(ROOT_DIR, 'api_yamdb'), env=environment)
+
+
+def wait_ready(process, url, timeout=30):
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn завершился с кодом {process.poll()}')
+        try:
+            with urlopen(f'{url}/api/v1/categories/'):
+                return
+        except (URLError, ConnectionError):
+            sleep(0.2)
+    raise RuntimeError(f'Сервер не ответил за {timeout} с')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def load(client, requests, concurrency):
+    """Отправляет запросы из concurrency потоков параллельно."""
+    def call(request):
+        method, path, data, token = request
+        return client.request(method, path, data, token)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        responses = list(executor.map(call, requests))
+    elapsed = perf_counter() - start
+    summary = summarize(
+        [timing for _, timing, _ in responses], [],
+        [status for status, _, _ in responses])
+    summary['throughput_rps'] = round(len(requests) / elapsed, 1)
+    return summary
+
+
+def run(mode, options, requests):
+    url = f'http://127.0.0.1:{options.port}'
+    process = start_server(mode, options)
+    try:
+        wait_ready(process, url)
+        client = HttpClient(url)
+        load(client, requests[:options.warmup], options.concurrency)
+        return load(client, requests[options.warmup:], options.concurrency)
+    finally:
+        stop_server(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--comments-per-review', type=int, default=1)
+    parser.add_argument('--skew', type=float, default=1.1)
+    parser.add_argument('--seed', type=int, default=2022)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument(
+        '--threads', type=int,
+        help='Потоков на воркер, по умолчанию из gunicorn.conf.py')
+    parser.add_argument(
+        '--mode', action='append', choices=MODES,
+        help='Можно указать несколько раз, по умолчанию все доступные')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument(
+        '--no-cache', action='store_true', help='Отключить кеш ответов')
+    parser.add_argument('--output', help='Файл для JSON с результатами')
+    options = parser.parse_args()
+
+    parameters = {
+        key: value for key, value in vars(options).items()
+        if key not in ('output', 'mode', 'port')
+    }
+    dataset = prepare_database(options)
+    if dataset:
+        parameters['dataset'] = dataset
+    target = targets(Random(options.seed))
+    requests = [
+        plan(READS[number % len(READS)], number, target)
+        for number in range(options.warmup + options.requests)
+    ]
+    results = {}
+    for mode in options.mode or MODES:
+        if not available(mode):
+            modules = ('gunicorn',) + REQUIREMENTS.get(mode, ())
+            print(f'{mode}: пропущен, нужны {", ".join(modules)}')
+            continue
+        results[mode] = run(mode, options, requests)
+    print_results(results, COLUMNS)
+    print('Результаты:', save_results('serving', parameters, results,
+                                      options.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,54 @@
+import os
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings():
+    # Без DB_ENGINE в окружении тесты с базой идут на SQLite в памяти
+    if 'DB_ENGINE' in os.environ:
+        return
+    from django.conf import settings
+    from django.db import connections
+    # replica — отдельная база для тестов маршрутизации чтения на реплики
+    settings.DATABASES = {
+        alias: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+        for alias in ('default', 'replica')
+    }
+    connections.__init__(settings.DATABASES)
+    connections.__dict__.pop('databases', None)
+
+
+@pytest.fixture(autouse=True)
+def response_cache(monkeypatch):
+    # Тесты идут в одном процессе, поэтому кеш в памяти для них общий
+    monkeypatch.setattr('api.cache.RESPONSE_CACHE_TTL', 60)
+    monkeypatch.setattr('api.pagination.COUNT_CACHE_TTL', 30)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_search_index():
+    from reviews.search import index
+    yield
+    index.clear()
@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+    return [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre_{i}')
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def title(category, genres):
+    from reviews.models import Title
+    title = Title.objects.create(
+        name='Крестный отец', year=1972, category=category)
+    title.genre.set(genres[:2])
+    return title
+
+
+@pytest.fixture
+def review(title, user):
+    from reviews.models import Review
+    return Review.objects.create(
+        title=title, author=user, text='Отлично', score=9)
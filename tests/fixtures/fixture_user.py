@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser', email='testuser@yamdb.fake', password='1234567')
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser2', email='testuser2@yamdb.fake', password='1234567')
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin', email='testadmin@yamdb.fake', password='1234567',
+        role='admin')
+
+
+def get_client(user):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    token = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+    return client
+
+
+@pytest.fixture
+def user_client(user):
+    return get_client(user)
+
+
+@pytest.fixture
+def another_user_client(another_user):
+    return get_client(another_user)
+
+
+@pytest.fixture
+def admin_client(admin):
+    return get_client(admin)
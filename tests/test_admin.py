@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def staff_client(client, django_user_model):
+    superuser = django_user_model.objects.create_superuser(
+        username='TestSuperuser', email='superuser@yamdb.fake',
+        password='1234567')
+    client.force_login(superuser)
+    return client
+
+
+@pytest.fixture
+def catalogue(category, genres, django_user_model):
+    from reviews.models import Comment, GenreTitle, Review, Title
+
+    def add(number):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000, category=category)
+        GenreTitle.objects.create(title=title, genre=genres[0])
+        author = django_user_model.objects.create_user(
+            username=f'author_{number}', email=f'author_{number}@yamdb.fake')
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5)
+        Comment.objects.create(review=review, author=author, text='Ответ')
+
+    return add
+
+
+def changelist_queries(client, path):
+    from django.core.cache import cache
+
+    # Число строк кешируется пагинатором, считаем его в каждом замере
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(path)
+    assert response.status_code == 200
+    return len(context)
+
+
+@pytest.mark.django_db
+class TestAdminChangelists:
+
+    @pytest.mark.parametrize('model', ('review', 'comment', 'genretitle'))
+    def test_queries_do_not_grow_with_rows(
+            self, staff_client, catalogue, model):
+        path = f'/admin/reviews/{model}/'
+        catalogue(0)
+        few = changelist_queries(staff_client, path)
+        for number in range(1, 6):
+            catalogue(number)
+        assert changelist_queries(staff_client, path) == few
+
+    def test_search_by_related_fields(self, staff_client, catalogue):
+        for number in range(3):
+            catalogue(number)
+        response = staff_client.get(
+            '/admin/reviews/review/', {'q': 'author_1'})
+        assert list(response.context['cl'].result_list.values_list(
+            'author__username', flat=True)) == ['author_1']
+        response = staff_client.get(
+            '/admin/reviews/review/', {'q': 'AUTHOR_1'})
+        assert len(response.context['cl'].result_list) == 0, (
+            'Проверьте, что username сравнивается точно, без UPPER()'
+        )
+        response = staff_client.get(
+            '/admin/reviews/genretitle/', {'q': 'genre_0'})
+        assert len(response.context['cl'].result_list) == 3
+        response = staff_client.get(
+            '/admin/reviews/review/', {'q': 'Произведение'})
+        assert len(response.context['cl'].result_list) == 3
+
+    def test_search_filters_by_ids(self, staff_client, catalogue):
+        catalogue(0)
+        with CaptureQueriesContext(connection) as context:
+            staff_client.get('/admin/reviews/review/', {'q': 'author_0'})
+        assert any(
+            '"reviews_review"."author_id" IN (' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что отзывы фильтруются по id найденных авторов'
+        assert not any(
+            'UPPER("reviews_user"."username"' in query['sql']
+            for query in context.captured_queries
+        )
+        response = staff_client.get('/admin/reviews/review/', {'q': 'нет'})
+        assert len(response.context['cl'].result_list) == 0
+
+    def test_genre_title_str(self, catalogue):
+        from reviews.models import GenreTitle
+
+        catalogue(0)
+        assert str(GenreTitle.objects.get()) == 'Произведение 0 - Жанр 0'
@@ -0,0 +1,89 @@
+import os
+import runpy
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+SETTINGS = os.path.join(settings.BASE_DIR, 'api_yamdb', 'settings.py')
+
+
+@pytest.fixture
+def stateless_auth(monkeypatch):
+    from api.authentication import StatelessJWTAuthentication
+    from rest_framework.views import APIView
+
+    monkeypatch.setattr(
+        APIView, 'authentication_classes', (StatelessJWTAuthentication,))
+
+
+def get_token(client, user):
+    from django.contrib.auth.tokens import default_token_generator
+
+    response = client.post('/api/v1/auth/token/', {
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == 200
+    return response.json()['token']
+
+
+@pytest.mark.django_db
+class TestStatelessAuthentication:
+
+    def test_token_has_role_claims(self, client, admin):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = AccessToken(get_token(client, admin))
+        assert token['username'] == admin.username
+        assert token['role'] == 'admin'
+
+    def test_write_without_user_query(self, client, stateless_auth, user,
+                                      title, django_assert_num_queries):
+        token = get_token(client, user)
+        # Произведение, вставка отзыва, рейтинг, счетчик оценки
+        # и точки сохранения
+        with django_assert_num_queries(6):
+            response = client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                {'text': 'Текст', 'score': 5},
+                HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+
+    def test_role_change_is_respected(self, client, stateless_auth, admin):
+        token = get_token(client, admin)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        assert client.get('/api/v1/users/', **headers).status_code == 200
+        admin.role = 'user'
+        admin.save()
+        assert client.get('/api/v1/users/', **headers).status_code == 403
+
+    def test_me_is_loaded_from_database(self, client, stateless_auth, user):
+        token = get_token(client, user)
+        response = client.get(
+            '/api/v1/users/me/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        assert response.json()['email'] == user.email
+
+
+class TestStatelessSettings:
+
+    def load_settings(self, monkeypatch, **environment):
+        for name in ('CACHE_BACKEND', 'JWT_ACCESS_TOKEN_MINUTES'):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv('JWT_STATELESS', '1')
+        for name, value in environment.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(SETTINGS)
+
+    def test_requires_shared_cache(self, monkeypatch):
+        with pytest.raises(ImproperlyConfigured):
+            self.load_settings(monkeypatch)
+
+    def test_short_token_lifetime(self, monkeypatch):
+        config = self.load_settings(
+            monkeypatch, CACHE_BACKEND='django_redis.cache.RedisCache')
+        assert config['SIMPLE_JWT']['ACCESS_TOKEN_LIFETIME'] == timedelta(
+            minutes=15)
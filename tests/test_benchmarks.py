@@ -0,0 +1,61 @@
+import pytest
+from benchmarks.common import percentile, summarize
+from benchmarks.compare import compare
+from benchmarks.dataset import review_counts, seed
+
+
+class TestBenchmarkHelpers:
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([7], 0.95) == 7
+
+    def test_summarize(self):
+        summary = summarize([0.001, 0.002, 0.010], [2, 2, 5], [200, 200, 404])
+        assert summary['p50_ms'] == 2
+        assert summary['queries_max'] == 5
+        assert summary['statuses'] == {'200': 2, '404': 1}
+
+    def test_review_counts_are_skewed(self):
+        counts = review_counts(100, 1000, 1.1, 50)
+        assert counts == sorted(counts, reverse=True)
+        assert counts[0] == 50
+        assert counts[-1] < 10
+
+    def test_compare(self):
+        baseline = {'results': {'title-list': {
+            'p50_ms': 10, 'p95_ms': 20, 'p99_ms': 30, 'queries_mean': 3}}}
+        current = {'results': {'title-list': {
+            'p50_ms': 10.5, 'p95_ms': 25, 'p99_ms': 30, 'queries_mean': 4}}}
+        rows, regressions = compare(baseline, current, 0.1)
+        assert regressions == 2
+        assert {row[1] for row in rows if row[-1]} == {
+            'p95_ms', 'queries_mean'}
+
+
+@pytest.mark.django_db
+class TestBenchmarkDataset:
+
+    def test_seed_is_deterministic(self):
+        from reviews.models import Category, Genre, Review, Title, User
+
+        result = seed(titles=20, users=10, reviews_per_title=3)
+        assert result['titles'] == Title.objects.count() == 20
+        assert result['reviews'] == Review.objects.count()
+        first = list(Title.objects.order_by('pk').values_list(
+            'name', 'year', 'reviews_count'))
+        assert first[0][2] == 10
+        for model in (Title, Category, Genre, User):
+            model.objects.all().delete()
+        seed(titles=20, users=10, reviews_per_title=3)
+        assert list(Title.objects.order_by('pk').values_list(
+            'name', 'year', 'reviews_count')) == first
+
+
+def test_compare_throughput():
+    baseline = {'results': {'gthread': {'throughput_rps': 100}}}
+    current = {'results': {'gthread': {'throughput_rps': 85}}}
+    assert compare(baseline, current, 0.1)[1] == 1
+    assert compare(baseline, current, 0.2)[1] == 0
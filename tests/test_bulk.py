@@ -0,0 +1,170 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestBulkCatalogue:
+
+    def test_admin_only(self, user_client):
+        response = user_client.post(
+            '/api/v1/bulk/genres/', [], format='json')
+        assert response.status_code == 403
+
+    def test_expects_list(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/bulk/genres/', {'name': 'Драма'}, format='json')
+        assert response.status_code == 400
+
+    def test_upsert_genres(self, admin_client, genres):
+        from reviews.models import Genre
+
+        response = admin_client.post('/api/v1/bulk/genres/', [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Новое имя', 'slug': 'genre_0'},
+            {'name': 'Без slug'},
+            {'name': 'Повтор', 'slug': 'drama'},
+        ], format='json')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['created'] == ['drama']
+        assert data['updated'] == ['genre_0']
+        assert [error['index'] for error in data['errors']] == [2, 3]
+        assert Genre.objects.get(slug='genre_0').name == 'Новое имя'
+        assert Genre.objects.get(slug='drama').name == 'Драма'
+
+    @pytest.mark.parametrize('url, slug', (
+        ('/api/v1/bulk/genres/', 'genre_0'),
+        ('/api/v1/bulk/categories/', 'movie'),
+    ))
+    def test_rename_changes_title_etag(self, admin_client, client, title,
+                                       url, slug):
+        title_url = f'/api/v1/titles/{title.id}/'
+        etag = client.get(title_url)['ETag']
+        admin_client.post(
+            url, [{'name': 'Новое имя', 'slug': slug}], format='json')
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert 'Новое имя' in response.content.decode()
+
+    def test_concurrent_insert_becomes_update(self, admin_client,
+                                              monkeypatch):
+        from reviews.models import Genre
+
+        in_bulk = Genre.objects.in_bulk
+
+        def insert_after_lookup(*args, **kwargs):
+            # Другой запрос создает тот же slug сразу после проверки
+            monkeypatch.setattr(Genre.objects, 'in_bulk', in_bulk)
+            existing = in_bulk(*args, **kwargs)
+            Genre.objects.create(name='Чужое имя', slug='drama')
+            return existing
+
+        monkeypatch.setattr(Genre.objects, 'in_bulk', insert_after_lookup)
+        response = admin_client.post('/api/v1/bulk/genres/', [
+            {'name': 'Драма', 'slug': 'drama'},
+        ], format='json')
+        assert response.status_code == 200
+        assert response.json()['updated'] == ['drama']
+        assert Genre.objects.get(slug='drama').name == 'Драма'
+
+    def test_repeated_conflict(self, admin_client, monkeypatch):
+        from django.db import IntegrityError
+        from reviews.models import Genre
+
+        def conflict(objs):
+            raise IntegrityError
+
+        monkeypatch.setattr(Genre.objects, 'bulk_create', conflict)
+        response = admin_client.post('/api/v1/bulk/genres/', [
+            {'name': 'Драма', 'slug': 'drama'},
+        ], format='json')
+        assert response.status_code == 409
+
+    def test_save_titles_query_count(self, admin_client, category, genres,
+                                     django_assert_max_num_queries):
+        from reviews.models import Title
+
+        items = [
+            {'name': f'Произведение {i}', 'year': 2000 + i,
+             'genre': ['genre_0', 'genre_1'], 'category': 'movie'}
+            for i in range(20)
+        ]
+        with django_assert_max_num_queries(12):
+            response = admin_client.post(
+                '/api/v1/bulk/titles/', items[:2], format='json')
+        assert response.status_code == 200
+        # Число запросов к справочникам не растет с размером пакета
+        with django_assert_max_num_queries(12 + len(items)):
+            response = admin_client.post(
+                '/api/v1/bulk/titles/', items, format='json')
+        assert len(response.json()['created']) == len(items)
+        title = Title.objects.get(pk=response.json()['created'][0])
+        assert title.category == category
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'genre_0', 'genre_1'}
+
+    def test_update_titles_with_errors(self, admin_client, title):
+        response = admin_client.post('/api/v1/bulk/titles/', [
+            {'id': title.id, 'name': 'Новое название', 'year': 1974,
+             'genre': ['genre_2'], 'category': None},
+            {'name': 'Без жанра', 'year': 2000, 'genre': ['unknown'],
+             'category': 'unknown'},
+            {'id': 100500, 'name': 'Нет такого', 'year': 2000, 'genre': []},
+        ], format='json')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['created'] == []
+        assert data['updated'] == [title.id]
+        assert set(data['errors'][0]['errors']) == {'genre', 'category'}
+        assert set(data['errors'][1]['errors']) == {'id'}
+        title.refresh_from_db()
+        assert title.name == 'Новое название'
+        assert title.category is None
+        assert list(title.genre.values_list('slug', flat=True)) == [
+            'genre_2']
+
+    def test_all_items_invalid(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/bulk/titles/', [{'name': 'Без года'}], format='json')
+        assert response.status_code == 400
+        assert response.json()['errors'][0]['index'] == 0
+
+
+@pytest.mark.django_db
+class TestBulkReviews:
+
+    def test_upsert_reviews(self, admin_client, client, title, review,
+                            another_user):
+        response = admin_client.post('/api/v1/bulk/reviews/', [
+            {'title': title.id, 'author': review.author.username,
+             'text': 'Передумал', 'score': 5},
+            {'title': title.id, 'author': another_user.username,
+             'text': 'Неплохо', 'score': 8},
+            {'title': title.id, 'author': 'nobody', 'text': 'Кто я',
+             'score': 1},
+            {'title': title.id, 'author': another_user.username,
+             'text': 'Повтор', 'score': 1},
+            {'title': title.id, 'author': another_user.username,
+             'text': 'Вне шкалы', 'score': 11},
+        ], format='json')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['updated'] == [review.id]
+        assert len(data['created']) == 1
+        assert [error['index'] for error in data['errors']] == [2, 3, 4]
+        review.refresh_from_db()
+        assert review.score == 5
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (2, 13)
+        histogram = client.get(
+            f'/api/v1/titles/{title.id}/stats/').json()['histogram']
+        assert (histogram['5'], histogram['8'], histogram['9']) == (1, 1, 0)
+
+    def test_list_reflects_bulk_reviews(self, admin_client, client, title,
+                                        review):
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url).json()['rating'] == 9
+        admin_client.post('/api/v1/bulk/reviews/', [
+            {'title': title.id, 'author': review.author.username,
+             'text': 'Хуже', 'score': 3},
+        ], format='json')
+        assert client.get(url).json()['rating'] == 3
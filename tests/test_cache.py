@@ -0,0 +1,76 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_title_detail_is_cached(self, client, title,
+                                    django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url)['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.json()['name'] == title.name
+
+    def test_query_string_is_part_of_key(self, client, title):
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+        assert client.get('/api/v1/titles/?year=1')['X-Cache'] == 'MISS'
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'HIT'
+
+    def test_review_invalidates_title_and_reviews(self, client, title, user,
+                                                  another_user):
+        from reviews.models import Review
+
+        Review.objects.create(title=title, author=user, text='a', score=2)
+        title_url = f'/api/v1/titles/{title.id}/'
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        for url in (title_url, reviews_url, '/api/v1/titles/'):
+            client.get(url)
+
+        Review.objects.create(
+            title=title, author=another_user, text='b', score=4)
+        response = client.get(title_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 3
+        response = client.get(reviews_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 2
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+
+    def test_genre_change_invalidates_lists(self, client, title, genres):
+        client.get('/api/v1/genres/')
+        client.get(f'/api/v1/titles/{title.id}/')
+        genres[2].name = 'Новое имя'
+        genres[2].save()
+        assert client.get('/api/v1/genres/')['X-Cache'] == 'MISS'
+        title.genre.add(genres[2])
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response['X-Cache'] == 'MISS'
+        assert len(response.json()['genre']) == 3
+
+    def test_only_username_invalidates_reviews(self, client, review, user,
+                                               django_user_model):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        client.get(url)
+        django_user_model.objects.create_user(
+            username='newcomer', email='newcomer@yamdb.fake')
+        user.bio = 'Новая биография'
+        user.email = 'changed@yamdb.fake'
+        user.save()
+        assert client.get(url)['X-Cache'] == 'HIT'
+        user.username = 'renamed'
+        user.save()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['author'] == 'renamed'
+
+    def test_stats(self, admin_client, title):
+        from api.cache import stats
+
+        before = stats.as_dict()
+        admin_client.get('/api/v1/categories/')
+        admin_client.get('/api/v1/categories/')
+        response = admin_client.get('/api/v1/cache/stats/')
+        assert response.json() == {
+            'hits': before['hits'] + 1, 'misses': before['misses'] + 1}
@@ -0,0 +1,105 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_title_not_modified(self, client, title,
+                                django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert response.has_header('Last-Modified')
+
+        from django.core.cache import cache
+        cache.clear()
+        # Только чтение updated_at, без загрузки произведения и жанров
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_cached_title_not_modified(self, client, title,
+                                       django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/'
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_review_changes_etag(self, client, title, user, another_user):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='a', score=5)
+        urls = (
+            f'/api/v1/titles/{title.id}/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+        )
+        etags = [client.get(url)['ETag'] for url in urls]
+        review.text = 'b'
+        review.save()
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, url
+            assert response['ETag'] != etag
+
+    @pytest.mark.parametrize('change', (
+        'rename_category', 'delete_category', 'rename_genre', 'delete_genre',
+        'add_genre', 'clear_genre_titles',
+    ))
+    def test_related_changes_title_etag(self, client, title, genres, change):
+        url = f'/api/v1/titles/{title.id}/'
+        etag = client.get(url)['ETag']
+        category, genre = title.category, genres[0]
+        if change == 'rename_category':
+            category.name = 'Кино'
+            category.save()
+        elif change == 'delete_category':
+            category.delete()
+        elif change == 'rename_genre':
+            genre.name = 'Драма'
+            genre.save()
+        elif change == 'delete_genre':
+            genre.delete()
+        elif change == 'add_genre':
+            title.genre.add(genres[2])
+        else:
+            genre.title_set.clear()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, change
+        assert response['ETag'] != etag
+
+    def test_username_changes_review_etags(self, client, review, user):
+        from reviews.models import Comment
+
+        Comment.objects.create(review=review, author=user, text='c')
+        base = f'/api/v1/titles/{review.title_id}/reviews/'
+        urls = (
+            base, f'{base}{review.id}/', f'{base}{review.id}/comments/')
+        etags = [client.get(url)['ETag'] for url in urls]
+        user.username = 'renamed'
+        user.save()
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, url
+            assert 'renamed' in response.content.decode()
+
+    def test_comment_changes_review_etag(self, client, review, user):
+        from reviews.models import Comment
+
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Comment.objects.create(review=review, author=user, text='c')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['count'] == 1
+
+    def test_if_modified_since(self, client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
@@ -27,3 +27,18 @@ class TestDockerfileCompose:
         assert re.search(r'image:\s+([a-zA-Z0-9]+)\/([a-zA-Z0-9_\.])+(\:[a-zA-Z0-9_-]+)?', docker_compose), (
             'Проверьте, что добавили сборку контейнера из образа на вашем DockerHub в файл docker-compose.yaml'
         )
+
+    def test_app_services_share_cache(self):
+        # JWT_STATELESS без общего кеша не дает запустить приложение
+        with open(os.path.join(infra_dir_path, 'docker-compose.yaml')) as f:
+            services = re.split(r'\n  (?=\w+:\n)', f.read())
+        app_services = [
+            service for service in services
+            if 'avnikitenko/api_yamdb' in service
+        ]
+        assert len(app_services) == 4
+        for service in app_services:
+            name = service.split(':', 1)[0]
+            assert 'CACHE_BACKEND=' in service, name
+            assert re.search(r'depends_on:(\n\s+- \w+)*\n\s+- redis',
+                             service), name
@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+def send_emails(*args):
+    call_command('send_emails', '--once', *args, stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def test_signup_queues_email(self, client):
+        from api.models import OutgoingEmail
+
+        response = client.post(
+            '/api/v1/auth/signup/',
+            {'username': 'newuser', 'email': 'newuser@yamdb.fake'}
+        )
+        assert response.status_code == 200
+        assert mail.outbox == []
+        email = OutgoingEmail.objects.get()
+        assert email.to == 'newuser@yamdb.fake'
+
+        send_emails()
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newuser@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent_at is not None
+
+        send_emails()
+        assert len(mail.outbox) == 1
+
+    def test_batches_share_connection(self, monkeypatch):
+        from api.models import OutgoingEmail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        opened = []
+        original_open = EmailBackend.open
+        monkeypatch.setattr(
+            EmailBackend, 'open',
+            lambda self: opened.append(self) or original_open(self))
+        OutgoingEmail.objects.bulk_create(
+            OutgoingEmail(subject='s', body='b', from_email='a@yamdb.fake',
+                          to=f'user{i}@yamdb.fake')
+            for i in range(5)
+        )
+        send_emails('--batch-size', '2')
+        assert len(mail.outbox) == 5
+        assert len(opened) == 3
+
+    def test_failed_email_is_retried_later(self, monkeypatch):
+        from api.models import OutgoingEmail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        def fail(self, messages):
+            raise ConnectionError('smtp is down')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        email = OutgoingEmail.objects.create(
+            subject='s', body='b', from_email='a@yamdb.fake',
+            to='user@yamdb.fake')
+        send_emails()
+        email.refresh_from_db()
+        assert email.attempts == 1
+        assert email.sent_at is None
+        assert 'smtp is down' in email.last_error
+
+        monkeypatch.undo()
+        send_emails()
+        assert mail.outbox == []
+
+        OutgoingEmail.objects.update(next_attempt_at=email.created_at)
+        send_emails()
+        assert len(mail.outbox) == 1
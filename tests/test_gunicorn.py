@@ -0,0 +1,50 @@
+import os
+import runpy
+
+import pytest
+from django.conf import settings
+
+CONFIG = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+
+
+def load_config(monkeypatch, **environment):
+    for name in ('GUNICORN_WORKER_CLASS', 'GUNICORN_WORKERS',
+                 'GUNICORN_THREADS', 'GUNICORN_PRELOAD', 'DB_CONN_MAX_AGE'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in environment.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(CONFIG)
+
+
+class TestGunicornConfig:
+
+    def test_defaults(self, monkeypatch):
+        config = load_config(monkeypatch)
+        assert config['worker_class'] == 'gthread'
+        assert config['wsgi_app'] == 'api_yamdb.wsgi:application'
+        assert config['workers'] == os.cpu_count() * 2 + 1
+        assert config['threads'] == 4
+        assert config['preload_app']
+        assert config['max_requests'] > 0
+
+    def test_environment(self, monkeypatch):
+        config = load_config(
+            monkeypatch, GUNICORN_WORKER_CLASS='sync', GUNICORN_WORKERS='3')
+        assert config['worker_class'] == 'sync'
+        assert config['workers'] == 3
+        assert config['threads'] == 1
+
+    def test_gevent(self, monkeypatch):
+        config = load_config(monkeypatch, GUNICORN_WORKER_CLASS='gevent')
+        assert config['worker_class'] == 'gevent'
+        assert not config['preload_app']
+        assert os.environ['DB_CONN_MAX_AGE'] == '0'
+
+    def test_asgi(self, monkeypatch):
+        config = load_config(monkeypatch, GUNICORN_WORKER_CLASS='asgi')
+        assert config['worker_class'] == 'uvicorn.workers.UvicornWorker'
+        assert config['wsgi_app'] == 'api_yamdb.asgi:application'
+
+    def test_unknown_worker_class(self, monkeypatch):
+        with pytest.raises(ValueError):
+            load_config(monkeypatch, GUNICORN_WORKER_CLASS='eventlet')
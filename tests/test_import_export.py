@@ -0,0 +1,196 @@
+import json
+from datetime import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def catalogue_files(tmp_path):
+    return {
+        'users': write(tmp_path / 'users.csv', (
+            'id,username,email,role,bio,first_name,last_name\n'
+            '100,bingobongo,bingo@yamdb.fake,user,,,\n'
+            '101,capt_obvious,capt@yamdb.fake,admin,,,\n'
+            '102,100,digits@yamdb.fake,user,,,\n'
+        )),
+        'categories': write(tmp_path / 'category.csv', (
+            'id,name,slug\n1,Фильм,movie\n2,Книга,book\n'
+        )),
+        'genres': write(tmp_path / 'genre.jsonl', '\n'.join(
+            json.dumps(genre) for genre in (
+                {'id': 1, 'name': 'Драма', 'slug': 'drama'},
+                {'id': 2, 'name': 'Комедия', 'slug': 'comedy'},
+            )
+        )),
+        'titles': write(tmp_path / 'titles.csv', (
+            'id,name,year,category,category_id\n'
+            '1,Шоушенк,1994,movie,\n'
+            '2,Война и мир,1869,,2\n'
+            '3,Без категории,2000,,\n'
+        )),
+        'genre_titles': write(tmp_path / 'genre_title.csv', (
+            'id,title_id,genre,genre_id\n1,1,drama,\n2,2,,1\n3,2,comedy,\n'
+        )),
+        'reviews': write(tmp_path / 'review.csv', (
+            'id,title_id,text,author,author_id,score,pub_date\n'
+            '1,1,Отлично,bingobongo,,10,2019-09-24T21:08:21.567Z\n'
+            '2,1,Хорошо,,101,6,2019-09-25T21:08:21.567Z\n'
+            '3,2,Автора нет,nobody,,5,2019-09-25T21:08:21.567Z\n'
+        )),
+        'comments': write(tmp_path / 'comments.csv', (
+            'id,review_id,text,author,pub_date\n'
+            '1,1,Согласен,capt_obvious,2019-09-26T21:08:21.567Z\n'
+            '2,1,Из цифр,100,2019-09-26T21:08:21.567Z\n'
+        )),
+    }
+
+
+@pytest.mark.django_db
+class TestImportCatalogue:
+
+    def test_import(self, catalogue_files):
+        from reviews.models import Comment, GenreTitle, Review, Title, User
+
+        stdout, stderr = StringIO(), StringIO()
+        args = []
+        for name, path in catalogue_files.items():
+            args += [f'--{name.replace("_", "-")}', path]
+        call_command('import_catalogue', *args, '--batch-size', '2',
+                     stdout=stdout, stderr=stderr)
+
+        assert User.objects.get(pk=101).role == 'admin'
+        assert not User.objects.get(pk=100).has_usable_password()
+        title = Title.objects.get(pk=1)
+        assert title.category.slug == 'movie'
+        assert Title.objects.get(pk=2).category.slug == 'book'
+        assert Title.objects.get(pk=3).category is None
+        assert GenreTitle.objects.filter(title_id=2).count() == 2
+        assert Review.objects.count() == 2
+        assert Review.objects.get(pk=1).pub_date.year == 2019
+        assert (title.reviews_count, title.score_sum) == (2, 16)
+        assert sum(title.score_counts.values_list('count', flat=True)) == 2
+        assert title.ranking.rating == pytest.approx(8)
+        assert Comment.objects.get(pk=1).author.username == 'capt_obvious'
+        assert Comment.objects.get(pk=2).author.username == '100', (
+            'Проверьте, что username из цифр ищется по username, а не по id'
+        )
+        assert 'nobody' in stderr.getvalue()
+        assert 'reviews: 2 записей' in stdout.getvalue()
+
+    def test_copy_splits_explicit_ids(self, monkeypatch):
+        from api.management.commands.import_catalogue import Command
+        from reviews.models import Category
+
+        command = Command()
+        command.use_copy = True
+        groups = []
+        monkeypatch.setattr(
+            command, 'copy',
+            lambda model, objs: groups.append([obj.pk for obj in objs]))
+        command.insert(Category, [
+            Category(pk=1, slug='a'), Category(slug='b'), Category(pk=3)])
+        assert groups == [[1, 3], [None]]
+
+    def test_skips_conflicting_rows(self, catalogue_files, tmp_path):
+        from reviews.models import Review
+
+        reviews = write(tmp_path / 'conflicts.csv', (
+            'id,title_id,text,author_id,score\n'
+            '1,1,Отлично,100,10\n'
+            '2,999,Нет произведения,100,5\n'
+            '3,1,Второй отзыв автора,100,3\n'
+            '4,2,Хорошо,101,6\n'
+        ))
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'import_catalogue',
+            '--users', catalogue_files['users'],
+            '--categories', catalogue_files['categories'],
+            '--titles', catalogue_files['titles'],
+            '--reviews', reviews,
+            stdout=stdout, stderr=stderr)
+        assert sorted(Review.objects.values_list('pk', flat=True)) == [1, 4]
+        errors = stderr.getvalue()
+        assert 'reviews, запись 2: ' in errors
+        assert '999' in errors
+        assert 'reviews, запись 3: ' in errors
+        assert 'reviews: 2 записей' in stdout.getvalue()
+        assert 'пропущено 2' in stdout.getvalue()
+
+    def test_requires_files(self):
+        from django.core.management.base import CommandError
+
+        with pytest.raises(CommandError):
+            call_command('import_catalogue', stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestExportCatalogue:
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_ndjson(self, admin_client, title, review):
+        response = admin_client.get('/api/v1/titles/export/')
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        assert rows == [{
+            'id': title.id,
+            'name': title.name,
+            'year': title.year,
+            'description': None,
+            'category': 'movie',
+            'genre': ['genre_0', 'genre_1'],
+            'rating': review.score,
+            'updated_at': rows[0]['updated_at'],
+        }]
+
+    def test_export_csv_since(self, admin_client, title):
+        from reviews.models import Title
+
+        Title.objects.filter(pk=title.pk).update(
+            updated_at='2020-01-01T00:00:00Z')
+        Title.objects.create(name='Новое', year=2021)
+        response = admin_client.get(
+            '/api/v1/titles/export/?output=csv&since=2021-01-01')
+        lines = self.read(response).splitlines()
+        assert lines[0].startswith('id,name,year')
+        assert len(lines) == 2
+        assert 'Новое' in lines[1]
+
+    def test_export_since_includes_renamed_category(self, title, category):
+        from api.export import export_titles
+        from reviews.models import Title
+
+        Title.objects.filter(pk=title.pk).update(
+            updated_at='2020-01-01T00:00:00Z')
+        category.name = 'Кино'
+        category.save()
+        rows = list(export_titles(datetime(2021, 1, 1, tzinfo=timezone.utc)))
+        assert [row['id'] for row in rows] == [title.id]
+
+    def test_parse_since_is_aware(self):
+        from api.export import parse_since
+
+        for value in ('2021-01-01', '2021-01-01T00:00:00'):
+            assert parse_since(value) == timezone.make_aware(
+                datetime(2021, 1, 1)), value
+        with pytest.raises(ValueError):
+            parse_since('вчера')
+
+    def test_export_is_admin_only(self, client, user_client):
+        assert client.get('/api/v1/titles/export/').status_code == 401
+        assert user_client.get('/api/v1/titles/export/').status_code == 403
+
+    def test_export_command(self, title):
+        stdout = StringIO()
+        call_command('export_catalogue', '--output', 'csv', stdout=stdout)
+        assert title.name in stdout.getvalue()
@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    from api.metrics import registry
+    registry.clear()
+    return registry
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_route_metrics(self, client, title, registry):
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{title.id}/')
+        client.get('/api/v1/titles/100500/')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        assert ('yamdb_requests_total{route="titles-list",method="GET",'
+                'status="200"} 1') in text
+        assert ('yamdb_requests_total{route="titles-detail",method="GET",'
+                'status="404"} 1') in text
+        assert ('yamdb_sql_queries_bucket{route="titles-list",'
+                'method="GET",le="+Inf"} 1') in text
+        histogram = registry.histograms['sql_queries'][
+            ('titles-list', 'GET')]
+        assert histogram.sum == 3
+        serialization = registry.histograms[
+            'serialization_duration_seconds'][('titles-detail', 'GET')]
+        assert serialization.count == 2 and serialization.sum > 0
+
+    def test_cache_stats_exported(self, client):
+        from api.cache import stats
+
+        before = stats.as_dict()
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        text = client.get('/metrics').content.decode()
+        assert (f'yamdb_response_cache_hits_total {before["hits"] + 1}'
+                in text)
+        assert (f'yamdb_response_cache_misses_total {before["misses"] + 1}'
+                in text)
+
+    def test_query_budget_warning(self, client, title, caplog,
+                                  monkeypatch):
+        from api import metrics
+
+        monkeypatch.setattr(metrics, 'QUERY_BUDGET', 2)
+        with caplog.at_level(logging.WARNING, logger='api.metrics'):
+            client.get(f'/api/v1/titles/{title.id}/')
+            client.get('/api/v1/genres/')
+        assert len(caplog.records) == 1
+        assert 'titles-detail' in caplog.records[0].getMessage()
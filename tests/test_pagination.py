@@ -0,0 +1,118 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    @pytest.fixture
+    def reviews(self, title, django_user_model):
+        from reviews.models import Review
+
+        reviews = []
+        for i in range(7):
+            author = django_user_model.objects.create_user(
+                username=f'author{i}', email=f'author{i}@yamdb.fake')
+            reviews.append(Review.objects.create(
+                title=title, author=author, text=f'Отзыв {i}', score=5))
+        return reviews
+
+    def test_walk_reviews_with_cursor(self, client, title, reviews):
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor=&page_size=3'
+        seen = []
+        pages = 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            data = response.json()
+            assert 'count' not in data
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+            pages += 1
+        assert pages == 3
+        assert seen == [review.id for review in reviews]
+
+    def test_keyset_page_has_no_count_and_offset(self, client, title,
+                                                 reviews):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=&page_size=2')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(response.json()['next'])
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'COUNT(' not in sql
+        assert 'OFFSET' not in sql
+        assert [item['id'] for item in response.json()['results']] == [
+            reviews[2].id, reviews[3].id]
+
+    def test_page_size_is_bounded(self, client, title, reviews,
+                                  monkeypatch):
+        from api.pagination import KeysetPagination
+
+        monkeypatch.setattr(KeysetPagination, 'max_page_size', 4)
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=&page_size=100')
+        assert len(response.json()['results']) == 4
+
+    def test_invalid_cursor(self, client, title):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?cursor=broken')
+        assert response.status_code == 404
+
+    def test_titles_cursor(self, client, title):
+        response = client.get('/api/v1/titles/?cursor=')
+        assert response.json() == {
+            'next': None, 'results': [response.json()['results'][0]]}
+        assert response.json()['results'][0]['id'] == title.id
+
+
+@pytest.mark.django_db
+class TestPageCount:
+
+    @pytest.fixture
+    def titles(self, category):
+        from reviews.models import Title
+
+        return [
+            Title.objects.create(name=f'Книга {i}', year=2000, category=category)
+            for i in range(6)
+        ]
+
+    def test_count_can_be_skipped(self, client, titles,
+                                  django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = client.get('/api/v1/titles/?count=false')
+        data = response.json()
+        assert 'count' not in data
+        assert len(data['results']) == 5
+        assert data['next'] is not None
+        response = client.get(data['next'])
+        assert len(response.json()['results']) == 1
+        assert response.json()['next'] is None
+
+    def test_filtered_count_is_cached(self, client, titles,
+                                      django_assert_num_queries):
+        url = '/api/v1/titles/?year=2000'
+        assert client.get(url).json()['count'] == len(titles)
+        with django_assert_num_queries(2):
+            response = client.get(url + '&page=2')
+        assert response.json()['count'] == len(titles)
+
+    def test_page_out_of_range(self, client, titles):
+        assert client.get('/api/v1/titles/?page=3').status_code == 404
+        assert client.get('/api/v1/titles/?page=last').json()['results']
+
+    def test_last_page_uses_exact_count(self, client, titles):
+        from reviews.models import Title
+
+        url = '/api/v1/titles/?year=2000'
+        assert client.get(url).json()['count'] == len(titles)
+        # update() не вызывает сигналов, count в кеше устарел
+        Title.objects.filter(pk__in=[title.pk for title in titles[3:]]).update(
+            year=1999)
+        response = client.get(url + '&page=last')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 3
+        assert len(data['results']) == 3
@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+from psycopg2.extensions import (TRANSACTION_STATUS_IDLE,
+                                 TRANSACTION_STATUS_INTRANS)
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        from psycopg2 import OperationalError
+        if self.connection.broken:
+            raise OperationalError('server closed the connection')
+
+
+class FakeConnection:
+    isolation_level = None
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+@pytest.fixture
+def pools():
+    from api_yamdb.postgresql_pool.pool import pools
+    yield pools
+    pools.clear()
+
+
+class TestConnectionPool:
+
+    def make_pool(self, **options):
+        from api_yamdb.postgresql_pool.pool import ConnectionPool
+        return ConnectionPool(**options)
+
+    def test_connections_are_reused(self):
+        pool = self.make_pool()
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        assert pool.acquire(FakeConnection) is connection
+        assert pool.stats()['size'] == 1
+        assert pool.stats()['checkouts'] == 2
+
+    def test_timeout_when_exhausted(self):
+        from api_yamdb.postgresql_pool.pool import PoolTimeout
+
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        pool.acquire(FakeConnection)
+        with pytest.raises(PoolTimeout):
+            pool.acquire(FakeConnection)
+        assert pool.stats()['timeouts'] == 1
+
+    def test_waiter_gets_released_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        connection = pool.acquire(FakeConnection)
+        timer = threading.Timer(0.05, pool.release, (connection,))
+        timer.start()
+        assert pool.acquire(FakeConnection) is connection
+        timer.join()
+        assert pool.stats()['waits'] >= 1
+
+    def test_release_resets_or_discards(self):
+        pool = self.make_pool()
+        in_transaction = pool.acquire(FakeConnection)
+        closed = pool.acquire(FakeConnection)
+        in_transaction.status = TRANSACTION_STATUS_INTRANS
+        closed.closed = 2
+        pool.release(in_transaction)
+        pool.release(closed)
+        assert in_transaction.status == TRANSACTION_STATUS_IDLE
+        assert pool.stats() == dict(
+            pool.stats(), size=1, idle=1, in_use=0, discarded=1)
+
+    def test_stale_connection_is_checked(self):
+        pool = self.make_pool(check_interval=0)
+        connection = pool.acquire(FakeConnection)
+        pool.release(connection)
+        connection.broken = True
+        fresh = pool.acquire(FakeConnection)
+        assert fresh is not connection
+        assert connection.closed
+
+    def test_new_pool_after_fork(self, pools, monkeypatch):
+        from api_yamdb.postgresql_pool import pool as module
+
+        parent = module.get_pool('default', {'MAX_SIZE': 3})
+        assert parent.max_size == 3
+        assert module.get_pool('default', {}) is parent
+        monkeypatch.setattr(module.os, 'getpid', lambda: parent.pid + 1)
+        assert module.get_pool('default', {}) is not parent
+
+
+class TestPoolBackend:
+
+    def test_close_returns_connection_to_pool(self, pools, monkeypatch):
+        from api_yamdb.postgresql_pool.base import DatabaseWrapper
+        from django.db.backends.postgresql import base
+
+        monkeypatch.setattr(
+            base.Database, 'connect', lambda **params: FakeConnection())
+        wrapper = DatabaseWrapper({
+            'NAME': 'yamdb', 'OPTIONS': {}, 'POOL': {'MAX_SIZE': 2},
+        }, alias='pooled')
+        connection = wrapper.get_new_connection({})
+        wrapper.connection = connection
+        wrapper._close()
+        assert pools['pooled'].stats()['idle'] == 1
+        assert wrapper.get_new_connection({}) is connection
+
+    def test_pool_stats_in_metrics(self, pools, client):
+        from api_yamdb.postgresql_pool.pool import get_pool
+
+        get_pool('pooled', {'MAX_SIZE': 4})
+        text = client.get('/metrics').content.decode()
+        assert 'yamdb_db_pool_max_size{alias="pooled"} 4' in text
+        assert 'yamdb_db_pool_timeouts_total{alias="pooled"} 0' in text
+
+
+class TestHealthCheck:
+
+    def test_unusable_connection_is_closed(self, monkeypatch):
+        from api import signals
+
+        class Wrapper:
+            connection = object()
+            in_atomic_block = False
+            closed = False
+
+            def is_usable(self):
+                return False
+
+            def close(self):
+                self.closed = True
+
+        wrapper = Wrapper()
+        monkeypatch.setattr(signals.connections, 'all', lambda: [wrapper])
+        signals.check_db_connections(sender=None)
+        assert wrapper.closed
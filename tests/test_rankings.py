@@ -0,0 +1,161 @@
+from datetime import timedelta
+from math import log2
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+class TestTitleRankings:
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        return [
+            django_user_model.objects.create_user(
+                username=f'author_{i}', email=f'author_{i}@yamdb.fake')
+            for i in range(3)
+        ]
+
+    @pytest.fixture
+    def catalogue(self, category, genres, authors):
+        from reviews.models import Review, Title
+
+        single = Title.objects.create(name='Один отзыв', year=2000)
+        single.genre.set(genres[:1])
+        many = Title.objects.create(
+            name='Много отзывов', year=2001, category=category)
+        many.genre.set(genres[1:2])
+        Title.objects.create(name='Без отзывов', year=2002)
+        Review.objects.create(
+            title=single, author=authors[0], text='Текст', score=10)
+        for author in authors:
+            Review.objects.create(
+                title=many, author=author, text='Текст', score=9)
+        return single, many
+
+    def ranking(self, client, name, **params):
+        response = client.get(f'/api/v1/titles/{name}/', params)
+        assert response.status_code == 200
+        return response.json()['results']
+
+    def trending(self, client):
+        return {
+            title['id']: title['score']
+            for title in self.ranking(client, 'trending')
+        }
+
+    def age(self, review, days):
+        from reviews.models import Review
+
+        Review.objects.filter(pk=review.pk).update(
+            pub_date=timezone.now() - timedelta(days=days))
+
+    def test_top_by_bayesian_rating(self, client, catalogue):
+        from reviews.rankings import refresh_rankings
+
+        single, many = catalogue
+        refresh_rankings()
+        results = self.ranking(client, 'top')
+        assert [title['id'] for title in results] == [single.id, many.id], (
+            'Проверьте, что произведения без отзывов не попадают в рейтинг'
+        )
+        # Средняя по всем отзывам 9.25, к оценкам добавлено 10 средних
+        assert results[0]['score'] == pytest.approx((92.5 + 10) / 11)
+        assert results[1]['score'] == pytest.approx((92.5 + 27) / 13)
+        assert results[1]['rating'] == 9
+        assert results[1]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+
+        results = self.ranking(client, 'top', min_reviews=2)
+        assert [title['id'] for title in results] == [many.id]
+
+    def test_filters(self, client, catalogue):
+        from reviews.rankings import refresh_rankings
+
+        single, many = catalogue
+        refresh_rankings()
+        for name, params, expected in (
+            ('top', {'genre': 'genre_0'}, [single.id]),
+            ('top', {'genre': 'genre_0,genre_1'}, [single.id, many.id]),
+            ('top', {'category': 'movie'}, [many.id]),
+            ('trending', {'genre': 'genre_0'}, [single.id]),
+            ('trending', {'genre': 'genre_0,genre_1'}, [many.id, single.id]),
+            ('trending', {'category': 'movie'}, [many.id]),
+        ):
+            assert [
+                title['id'] for title in self.ranking(client, name, **params)
+            ] == expected, (name, params)
+
+    def test_invalid_min_reviews(self, client, catalogue):
+        for value in ('-1', 'много'):
+            response = client.get(
+                '/api/v1/titles/top/', {'min_reviews': value})
+            assert response.status_code == 400
+
+    def test_trending_by_recent_reviews(self, client, catalogue):
+        from reviews.models import Review
+        from reviews.rankings import refresh_rankings
+
+        single, many = catalogue
+        for review in Review.objects.filter(title=many):
+            self.age(review, 14)
+        refresh_rankings()
+        results = self.ranking(client, 'trending')
+        assert [title['id'] for title in results] == [single.id, many.id]
+        # Отзыв двухнедельной давности весит четверть свежего
+        assert results[0]['score'] == pytest.approx(1, rel=1e-3)
+        assert results[1]['score'] == pytest.approx(0.75, rel=1e-3)
+
+    def test_incremental_refresh(self, client, catalogue, user):
+        from reviews.models import Review, TitleRanking
+        from reviews.rankings import refresh_rankings
+
+        single, many = catalogue
+        assert refresh_rankings() == 3
+        assert refresh_rankings() == 0, (
+            'Проверьте, что без новых отзывов рейтинг не пересчитывается'
+        )
+        Review.objects.create(
+            title=single, author=user, text='Текст', score=9)
+        assert refresh_rankings() == 3, (
+            'Проверьте, что изменение средней оценки пересчитывает рейтинг '
+            'всех произведений'
+        )
+        assert TitleRanking.objects.get(title=many).rating == pytest.approx(
+            (10 * 9.2 + 27) / 13)
+        many.refresh_from_db()
+        many.name = 'Новое название'
+        many.save()
+        assert refresh_rankings() == 1
+        assert self.trending(client)[single.id] == pytest.approx(2, rel=1e-3)
+
+        # Удаленные отзывы вычитаются из весов только полным пересчетом
+        Review.objects.filter(title=single, author=user).delete()
+        refresh_rankings()
+        assert self.trending(client)[single.id] == pytest.approx(2, rel=1e-3)
+        call_command(
+            'refresh_rankings', full=True, stdout=open('/dev/null', 'w'))
+        assert self.trending(client)[single.id] == pytest.approx(1, rel=1e-3)
+
+    def test_command_resets_cached_rankings(self, client, catalogue):
+        from reviews.models import Review, Title
+        from reviews.ratings import recalculate_ratings
+
+        single, many = catalogue
+        call_command(
+            'refresh_rankings', full=True, stdout=open('/dev/null', 'w'))
+        assert self.ranking(client, 'top')[0]['id'] == single.id
+        # Запись в обход сигналов не сбрасывает кеш ответов
+        Review.objects.filter(title=single).update(score=1)
+        recalculate_ratings(Title.objects.filter(pk=single.pk))
+        Title.objects.filter(pk=single.pk).update(updated_at=timezone.now())
+        assert self.ranking(client, 'top')[0]['id'] == single.id
+        call_command('refresh_rankings', stdout=open('/dev/null', 'w'))
+        assert self.ranking(client, 'top')[0]['id'] == many.id
+
+    def test_add_weights(self):
+        from reviews.rankings import add_weights
+
+        assert add_weights(None, 3) == 3
+        assert add_weights(1, 1) == pytest.approx(2)
+        assert add_weights(5000, 4999) == pytest.approx(5000 + log2(1.5))
@@ -0,0 +1,115 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def refresh(self, title):
+        title.refresh_from_db()
+        return title
+
+    def test_rating_follows_review_writes(self, title, user, another_user):
+        from reviews.models import Review
+
+        assert self.refresh(title).rating is None, (
+            'Проверьте, что рейтинг произведения без отзывов равен None'
+        )
+        first = Review.objects.create(
+            title=title, author=user, text='Текст', score=4)
+        Review.objects.create(
+            title=title, author=another_user, text='Текст', score=10)
+        assert self.refresh(title).rating == 7
+
+        first.score = 8
+        first.save()
+        assert self.refresh(title).rating == 9
+
+        first.delete()
+        title = self.refresh(title)
+        assert (title.reviews_count, title.score_sum) == (1, 10)
+
+        Review.objects.all().delete()
+        title = self.refresh(title)
+        assert (title.reviews_count, title.score_sum) == (0, 0)
+
+    def test_review_moved_to_another_title(self, title, review, category):
+        from reviews.models import Title
+
+        other = Title.objects.create(name='Другое', year=2000)
+        review.title = other
+        review.save()
+        assert self.refresh(title).reviews_count == 0
+        assert self.refresh(other).rating == review.score
+
+    def test_recalculate_ratings_command(self, title, review):
+        from reviews.models import Title
+
+        Title.objects.update(reviews_count=5, score_sum=1)
+        call_command('recalculate_ratings', stdout=open('/dev/null', 'w'))
+        title = self.refresh(title)
+        assert (title.reviews_count, title.score_sum) == (1, review.score)
+
+    def test_title_api_rating(self, client, title, review):
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert response.json()['rating'] == review.score
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def stats(self, client, title):
+        response = client.get(f'/api/v1/titles/{title.id}/stats/')
+        assert response.status_code == 200
+        return response.json()
+
+    def histogram(self, **counts):
+        return {
+            str(score): counts.get(f's{score}', 0) for score in range(1, 11)}
+
+    def test_empty_title(self, client, title):
+        assert self.stats(client, title) == {
+            'count': 0, 'mean': None, 'median': None,
+            'histogram': self.histogram(),
+        }
+
+    def test_missing_title(self, client):
+        assert client.get('/api/v1/titles/999/stats/').status_code == 404
+
+    def test_stats_follow_review_writes(
+            self, client, title, user, another_user, admin):
+        from reviews.models import Review
+
+        first = Review.objects.create(
+            title=title, author=user, text='Текст', score=4)
+        Review.objects.create(
+            title=title, author=another_user, text='Текст', score=9)
+        Review.objects.create(title=title, author=admin, text='Текст', score=9)
+        assert self.stats(client, title) == {
+            'count': 3, 'mean': 22 / 3, 'median': 9,
+            'histogram': self.histogram(s4=1, s9=2),
+        }
+
+        first.score = 10
+        first.save()
+        Review.objects.filter(author=admin).delete()
+        assert self.stats(client, title) == {
+            'count': 2, 'mean': 9.5, 'median': 9.5,
+            'histogram': self.histogram(s9=1, s10=1),
+        }
+
+    def test_constant_queries(self, client, title, review,
+                              django_assert_num_queries):
+        with django_assert_num_queries(2):
+            self.stats(client, title)
+
+    def test_recalculate_ratings_rebuilds_histogram(
+            self, client, title, review):
+        from reviews.models import TitleScoreCount
+
+        TitleScoreCount.objects.all().delete()
+        TitleScoreCount.objects.create(title=title, score=1, count=7)
+        call_command('recalculate_ratings', stdout=open('/dev/null', 'w'))
+        assert self.stats(client, title)['histogram'] == self.histogram(
+            **{f's{review.score}': 1})
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+DATA = OrderedDict((
+    ('id', 1),
+    ('name', 'Крестный отец\u2028'),
+    ('rating', 7.25),
+    ('price', Decimal('1.50')),
+    ('pub_date', datetime(2022, 3, 1, 12, 0, 0, 123456, timezone.utc)),
+    ('genre', [{'name': 'Драма', 'slug': 'drama'}]),
+    ('category', None),
+    ('label', gettext_lazy('Произведение')),
+    (1, 'ключ-число'),
+))
+
+
+@pytest.fixture(params=('orjson', 'fallback'))
+def renderer(request, monkeypatch):
+    from api.renderers import FastJSONRenderer
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr('api.renderers.orjson', None)
+    return FastJSONRenderer()
+
+
+class TestFastJSONRenderer:
+
+    def test_same_bytes_as_json_renderer(self, renderer):
+        assert renderer.render(DATA) == JSONRenderer().render(DATA)
+
+    def test_indent(self, renderer):
+        media_type = 'application/json; indent=4'
+        assert renderer.render(DATA, media_type) == JSONRenderer().render(
+            DATA, media_type)
+
+    def test_unsupported_by_orjson(self, renderer):
+        data = {'big': 2 ** 70}
+        assert renderer.render(data) == JSONRenderer().render(data)
+
+    def test_none(self, renderer):
+        assert renderer.render(None) == b''
+
+
+@pytest.fixture(params=('orjson', 'fallback'))
+def parser(request, monkeypatch):
+    from api.parsers import FastJSONParser
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr('api.parsers.orjson', None)
+    return FastJSONParser()
+
+
+class TestFastJSONParser:
+
+    def test_parse(self, parser):
+        content = '{"name": "Драма", "slug": "drama", "score": [1, 2.5]}'
+        assert parser.parse(BytesIO(content.encode())) == {
+            'name': 'Драма', 'slug': 'drama', 'score': [1, 2.5]}
+
+    @pytest.mark.parametrize('content', (b'{"name": ', b'[NaN]'))
+    def test_errors_as_json_parser(self, parser, content):
+        with pytest.raises(ParseError) as expected:
+            JSONParser().parse(BytesIO(content))
+        with pytest.raises(ParseError) as error:
+            parser.parse(BytesIO(content))
+        assert str(error.value) == str(expected.value)
+
+
+@pytest.mark.django_db
+def test_api_response_rendered(client, category, genres):
+    from reviews.models import Title
+
+    title = Title.objects.create(
+        name='Крестный отец', year=1972, category=category)
+    title.genre.set(genres)
+    response = client.get('/api/v1/titles/')
+    assert response.status_code == 200
+    assert response.content == JSONRenderer().render(response.data)
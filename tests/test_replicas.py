@@ -0,0 +1,104 @@
+import pytest
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    if 'replica' not in settings.DATABASES:
+        pytest.skip('Нужна вторая тестовая база (SQLite без DB_ENGINE)')
+    monkeypatch.setattr('api.replicas.REPLICA_DATABASES', ['replica'])
+    settings.DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+    return 'replica'
+
+
+def test_router_outside_request():
+    from api.replicas import ReplicaRouter, state
+    from reviews.models import Title
+
+    router = ReplicaRouter()
+    assert router.db_for_read(Title) == 'default'
+    state.database = 'replica_0'
+    try:
+        assert router.db_for_read(Title) == 'replica_0'
+        assert router.db_for_write(Title) == 'default'
+    finally:
+        state.database = None
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+class TestReplicaRouting:
+
+    @pytest.fixture
+    def replica_title(self, replica, category):
+        from reviews.models import Category, Title
+
+        # Данные есть только на реплике, как при отставании репликации
+        Category.objects.using(replica).create(
+            pk=category.pk, name=category.name, slug=category.slug)
+        return Title.objects.using(replica).create(
+            name='Только на реплике', year=2000, category_id=category.pk)
+
+    def test_safe_request_reads_replica(self, client, replica_title):
+        response = client.get(f'/api/v1/titles/{replica_title.pk}/')
+        assert response.status_code == 200
+        assert response.json()['name'] == 'Только на реплике'
+
+    def test_writes_go_to_primary(self, admin_client, replica, category):
+        from reviews.models import Title
+
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'category': category.slug,
+        })
+        assert response.status_code == 201
+        assert Title.objects.using('default').filter(name='Новое').exists()
+        assert not Title.objects.using(replica).exists()
+
+    def test_reads_pinned_after_write(
+            self, admin_client, replica, category):
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'category': category.slug,
+        })
+        assert response.status_code == 201
+        title_id = response.json()['id']
+        # Без закрепления чтение ушло бы на реплику, где записи еще нет
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200
+
+    def test_pinned_by_token_without_cookie(
+            self, admin_client, replica, category):
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'category': category.slug,
+        })
+        title_id = response.json()['id']
+        admin_client.cookies.clear()
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200
+
+    def test_anonymous_reads_replica_after_others_write(
+            self, client, admin_client, replica, category):
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'category': category.slug,
+        })
+        title_id = response.json()['id']
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 404
+
+    def test_replica_read_after_write_is_not_cached(
+            self, client, admin_client, replica, category):
+        from api.cache import recent_key
+        from django.core.cache import cache
+
+        admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'category': category.slug,
+        })
+        # Список с отстающей реплики не должен остаться в кеше под новой
+        # версией области titles
+        for _ in range(2):
+            response = client.get('/api/v1/titles/')
+            assert response.json()['results'] == []
+            assert response['X-Cache'] == 'MISS'
+
+        # Через REPLICA_PIN_SECONDS после записи ответы снова кешируются
+        cache.delete_many([
+            recent_key(scope) for scope in ('titles', 'categories', 'genres')])
+        client.get('/api/v1/titles/')
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'HIT'
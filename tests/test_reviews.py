@@ -0,0 +1,100 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestReviewWrites:
+
+    def test_create_review_query_count(self, user_client, title,
+                                       django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        # Пользователь, произведение, вставка отзыва, обновление рейтинга,
+        # счетчика оценки и точки сохранения транзакции вокруг записи
+        with django_assert_num_queries(7):
+            response = user_client.post(url, {'text': 'Текст', 'score': 7})
+        assert response.status_code == 201
+        assert response.json()['author'] == 'TestUser'
+        title.refresh_from_db()
+        assert title.rating == 7
+
+    def test_duplicate_review(self, user_client, title, review):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, {'text': 'Еще', 'score': 1})
+        assert response.status_code == 400
+        assert 'non_field_errors' in response.json()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.score_sum) == (1, review.score)
+
+    def test_review_of_missing_title(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/999/reviews/', {'text': 'Текст', 'score': 7})
+        assert response.status_code == 404
+
+    def test_partial_update_keeps_working(self, user_client, review):
+        response = user_client.patch(
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/',
+            {'score': 3})
+        assert response.status_code == 200
+        assert response.json()['score'] == 3
+
+
+@pytest.mark.django_db
+class TestCommentWrites:
+
+    def test_comment_needs_review_of_title(self, user_client, review,
+                                           category):
+        from reviews.models import Title
+
+        other = Title.objects.create(name='Другое', year=2000)
+        url = f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        assert user_client.post(url, {'text': 'c'}).status_code == 404
+        assert user_client.get(url).status_code == 404
+
+    def test_create_comment_query_count(self, user_client, review,
+                                        django_assert_num_queries):
+        url = (f'/api/v1/titles/{review.title_id}/reviews/'
+               f'{review.id}/comments/')
+        # Пользователь, отзыв, вставка комментария, updated_at отзыва
+        with django_assert_num_queries(4):
+            response = user_client.post(url, {'text': 'Комментарий'})
+        assert response.status_code == 201
+
+
+@pytest.mark.django_db
+class TestReviewReads:
+
+    @pytest.fixture
+    def reviews(self, title, django_user_model):
+        from reviews.models import Review
+
+        return [
+            Review.objects.create(
+                title=title,
+                author=django_user_model.objects.create_user(
+                    username=f'reader{i}', email=f'reader{i}@yamdb.fake'),
+                text='Текст',
+                score=i + 1,
+            )
+            for i in range(5)
+        ]
+
+    def test_review_page_query_count(self, client, title, reviews,
+                                     django_assert_num_queries):
+        # updated_at для ETag, произведение, COUNT и отзывы с авторами
+        with django_assert_num_queries(4):
+            response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert [item['author'] for item in response.json()['results']] == [
+            review.author.username for review in reviews]
+
+    def test_owner_check_does_not_load_author(self, user_client, review,
+                                              django_assert_num_queries):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        # Пользователь, отзыв с автором, точки сохранения, обновление
+        # отзыва и рейтинга
+        with django_assert_num_queries(7):
+            response = user_client.patch(url, {'text': 'Новый'})
+        assert response.status_code == 200
+
+    def test_other_user_cannot_edit(self, another_user_client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        response = another_user_client.patch(url, {'text': 'Чужой'})
+        assert response.status_code == 403
@@ -0,0 +1,109 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    @pytest.fixture
+    def catalogue(self, category, genres):
+        from reviews.models import Title
+
+        return [
+            Title.objects.create(
+                name='Крестный отец', year=1972, category=category,
+                description='Сага о семье Корлеоне'),
+            Title.objects.create(
+                name='Отец солдата', year=1964, category=category),
+            Title.objects.create(
+                name='Семья', year=2010, category=category,
+                description='Отец и его большая семья'),
+        ]
+
+    def search(self, client, text):
+        response = client.get('/api/v1/titles/search/', {'q': text})
+        assert response.status_code == 200
+        return response.json()
+
+    def test_query_required(self, client):
+        response = client.get('/api/v1/titles/search/')
+        assert response.status_code == 400
+
+    def test_ranking_and_headline(self, client, catalogue):
+        data = self.search(client, 'Отец')
+        assert data['count'] == 3
+        # Совпадение в названии весит больше, чем в описании
+        assert [item['id'] for item in data['results']] == [
+            catalogue[0].id, catalogue[1].id, catalogue[2].id]
+        assert data['results'][0]['headline'].startswith(
+            'Крестный <b>отец</b>')
+        assert data['results'][0]['rank'] > data['results'][2]['rank']
+
+    def test_headline_escapes_html(self, client, category):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='<img src=x onerror=alert(1)>', year=2000,
+            description='Отец <b>и</b> сын')
+        headline = self.search(client, 'отец')['results'][0]['headline']
+        assert '<img' not in headline
+        assert '&lt;img src=x onerror=alert(1)&gt;' in headline
+        assert '<b>Отец</b> &lt;b&gt;и&lt;/b&gt; сын' in headline
+
+    def test_all_words_must_match(self, client, catalogue):
+        data = self.search(client, 'отец семье')
+        assert [item['id'] for item in data['results']] == [
+            catalogue[0].id]
+
+    def test_index_follows_changes(self, client, catalogue):
+        assert self.search(client, 'отец')['count'] == 3
+        title = catalogue[1]
+        title.name = 'Баллада о солдате'
+        title.save()
+        catalogue[0].delete()
+        data = self.search(client, 'отец')
+        assert [item['id'] for item in data['results']] == [
+            catalogue[2].id]
+        assert self.search(client, 'баллада')['count'] == 1
+
+    def test_review_text(self, client, catalogue, user, monkeypatch):
+        from reviews import search
+        from reviews.models import Review
+
+        monkeypatch.setattr(search, 'SEARCH_REVIEWS', True)
+        assert self.search(client, 'шедевр')['count'] == 0
+        Review.objects.create(
+            title=catalogue[1], author=user, text='Настоящий шедевр',
+            score=10)
+        data = self.search(client, 'шедевр')
+        assert [item['id'] for item in data['results']] == [
+            catalogue[1].id]
+
+    def test_review_indexing_is_deferred(self, client, catalogue, user,
+                                         monkeypatch):
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews import search
+        from reviews.models import PendingSearchIndex, Review
+
+        monkeypatch.setattr(search, 'SEARCH_REVIEWS', True)
+        monkeypatch.setattr(search, 'defer_review_indexing', lambda: True)
+        assert self.search(client, 'шедевр')['count'] == 0
+        with CaptureQueriesContext(connection) as context:
+            Review.objects.create(
+                title=catalogue[1], author=user, text='Настоящий шедевр',
+                score=10)
+        assert not any(
+            '"reviews_review"."text"' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что запись отзыва не читает тексты других отзывов'
+        assert list(PendingSearchIndex.objects.values_list(
+            'title_id', flat=True)) == [catalogue[1].id]
+        assert self.search(client, 'шедевр')['count'] == 0
+
+        call_command(
+            'update_search_index', pending=True, stdout=open('/dev/null', 'w'))
+        assert not PendingSearchIndex.objects.exists()
+        data = self.search(client, 'шедевр')
+        assert [item['id'] for item in data['results']] == [
+            catalogue[1].id]
@@ -1,3 +1,5 @@
+import os
+
 from api_yamdb import settings
 
 
@@ -9,3 +11,13 @@ class TestSettings:
         assert settings.DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql', (
             'Проверьте, что используете базу данных postgresql'
         )
+
+    def test_response_cache_needs_shared_backend(self):
+        if {'CACHE_BACKEND', 'RESPONSE_CACHE_TTL', 'COUNT_CACHE_TTL'} & set(
+                os.environ):
+            return
+        assert not settings.CACHE_SHARED
+        assert settings.RESPONSE_CACHE_TTL == 0, (
+            'Проверьте, что с кешем в памяти процесса кеш ответов выключен'
+        )
+        assert settings.COUNT_CACHE_TTL == 0
@@ -0,0 +1,76 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+
+    def create_titles(self, count, category, genres):
+        from reviews.models import Title
+
+        for i in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {i}', year=2000 + i, category=category)
+            title.genre.set(genres)
+
+    @pytest.mark.parametrize('count', (1, 5))
+    def test_title_list_query_count(self, client, category, genres, count,
+                                    django_assert_num_queries):
+        self.create_titles(count, category, genres)
+        # COUNT для пагинации, страница произведений и жанры одним запросом
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == count
+        assert len(response.json()['results'][0]['genre']) == len(genres)
+
+    def test_title_detail_query_count(self, client, title,
+                                      django_assert_num_queries):
+        # updated_at для ETag, произведение с категорией и жанры
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert response.json()['category'] == {
+            'name': title.category.name, 'slug': title.category.slug}
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    @pytest.fixture
+    def catalogue(self, category, genres):
+        from reviews.models import Category, Title
+
+        book = Category.objects.create(name='Книга', slug='book')
+        titles = {
+            'old_movie': Title.objects.create(
+                name='Старое кино', year=1950, category=category),
+            'new_movie': Title.objects.create(
+                name='Новое кино', year=2010, category=category),
+            'new_book': Title.objects.create(
+                name='Новая книга', year=2012, category=book),
+        }
+        titles['old_movie'].genre.set(genres[:1])
+        titles['new_movie'].genre.set(genres[1:2])
+        titles['new_book'].genre.set(genres)
+        return titles
+
+    def get_ids(self, client, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200, query
+        return {item['id'] for item in response.json()['results']}
+
+    def test_filters_are_combined(self, client, catalogue):
+        assert self.get_ids(client, 'category=movie&year_min=2000') == {
+            catalogue['new_movie'].id}
+        assert self.get_ids(client, 'genre=genre_0&category=book') == {
+            catalogue['new_book'].id}
+        assert self.get_ids(client, 'name=кино&year=1950') == {
+            catalogue['old_movie'].id}
+
+    def test_multiple_genres(self, client, catalogue):
+        assert self.get_ids(client, 'genre=genre_0,genre_1') == {
+            title.id for title in catalogue.values()}
+
+    def test_year_range(self, client, catalogue):
+        assert self.get_ids(client, 'year_min=2000&year_max=2010') == {
+            catalogue['new_movie'].id}
@@ -0,0 +1,91 @@
+import pytest
+
+
+@pytest.fixture
+def catalogue(title, review, another_user, category, genres):
+    from reviews.models import Comment, Review, Title
+
+    Title.objects.create(name='Без категории и жанров', year=2001)
+    described = Title.objects.create(
+        name='С описанием', year=1999, category=category,
+        description='Описание с разделителем строк')
+    described.genre.set(genres[::-1])
+    Review.objects.create(
+        title=title, author=another_user, text='Неплохо', score=6)
+    Comment.objects.create(review=review, author=another_user, text='Да')
+    Comment.objects.create(review=review, author=review.author, text='Нет')
+    return title, review
+
+
+def urls(title, review):
+    reviews = f'/api/v1/titles/{title.id}/reviews/'
+    comments = f'{reviews}{review.id}/comments/'
+    return (
+        '/api/v1/titles/',
+        '/api/v1/titles/?page_size=2&page=2',
+        '/api/v1/titles/?genre=genre_1&count=0',
+        '/api/v1/titles/?cursor=&page_size=2',
+        f'/api/v1/titles/{title.id}/',
+        reviews,
+        f'{reviews}?cursor=&page_size=1',
+        f'{reviews}{review.id}/',
+        comments,
+        f'{comments}?cursor=&page_size=1',
+        f'{comments}{review.comments.first().id}/',
+    )
+
+
+def get_all(client, paths):
+    from django.core.cache import cache
+
+    contents = []
+    for path in paths:
+        cache.clear()
+        response = client.get(path)
+        assert response.status_code == 200, path
+        contents.append(response.content)
+    return contents
+
+
+@pytest.mark.django_db
+class TestValuesSerializersContract:
+
+    def test_same_bytes_as_model_serializers(
+            self, client, catalogue, monkeypatch):
+        from rest_framework.serializers import Serializer
+
+        paths = urls(*catalogue)
+        with monkeypatch.context() as patch:
+            patch.setattr(
+                'api.views.ValuesReadMixin.reads_values', lambda view: False)
+            expected = get_all(client, paths)
+
+        def model_serializer_used(*args):
+            raise AssertionError('Чтение должно идти через .values()')
+
+        monkeypatch.setattr(
+            Serializer, 'to_representation', model_serializer_used)
+        assert get_all(client, paths) == expected
+
+    def test_title_list_queries(self, client, catalogue,
+                                django_assert_max_num_queries):
+        # Страница, жанры всех произведений страницы и число записей
+        with django_assert_max_num_queries(3):
+            client.get('/api/v1/titles/')
+
+    def test_writes_use_model_serializers(self, admin_client, category):
+        response = admin_client.post('/api/v1/titles/', {
+            'name': 'Новое', 'year': 2000, 'category': category.slug,
+        })
+        assert response.status_code == 201
+        assert response.json()['category'] == category.slug
+
+
+def test_represent_is_required():
+    from api.serializers import ValuesSerializer
+
+    class Incomplete(ValuesSerializer):
+        values = ('id',)
+
+    with pytest.raises(TypeError):
+        Incomplete([])